@@ -0,0 +1,8 @@
+"""
+Fibonacci and Catalan lattice paths.
+
+The computational core imports without matplotlib, sympy or scipy; those are
+loaded by the plotting and symbolic functions when they are first used.
+"""
+from .paths import phi, psi, batch_phi, batch_psi, count_wall_paths, UniformWallPathSampler, iter_wall_paths
+from .utils import catalan_number, motzkin_number, fibonacci_number, functional_equation_coefficients
@@ -0,0 +1,382 @@
+"""
+Command-line entry point: python -m src <command> [options].
+
+Commands:
+    generate   random (or all) wall paths
+    convert    wall paths to Dyck or Motzkin paths
+    count      exact path counts by length
+    sample     uniform wall or Dyck paths, 3D self-avoiding walks
+    render     figures from a file of render jobs
+    bench      timings of the computational core
+
+Paths are written as NDJSON, one {"steps": [...]} object per line, or with
+--format corpus as a PathCorpus directory.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .paths.batch_convert import batch_phi, batch_psi
+from .paths.path_corpus import META_FILE, PathCorpus
+from .paths.step_codes import WALL_STEPS, DYCK_STEPS, MOTZKIN_STEPS, pack_paths, unpack_paths
+
+# Paths are generated, converted and written this many at a time
+BATCH_SIZE = 10000
+
+class PathWriter:
+    """Writes ragged batches of paths as NDJSON lines or to a corpus."""
+    def __init__(self, output, path_format, alphabet):
+        self.alphabet = alphabet
+        self.corpus = None
+        self.stream = None
+        if path_format == "corpus":
+            if output == "-":
+                raise SystemExit("--format corpus needs an --output directory")
+            self.corpus = PathCorpus.create(output, alphabet)
+        elif output == "-":
+            self.stream = sys.stdout
+        else:
+            directory = os.path.dirname(output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.stream = open(output, "w")
+
+    def write(self, codes, offsets):
+        if self.corpus is not None:
+            self.corpus.append(codes, offsets)
+        else:
+            lines = (json.dumps({"steps": steps}) for steps in unpack_paths(codes, offsets, self.alphabet))
+            self.stream.write("".join(line + "\n" for line in lines))
+
+    def write_paths(self, paths):
+        self.write(*pack_paths(paths, self.alphabet))
+
+    def close(self):
+        if self.stream is not None and self.stream is not sys.stdout:
+            self.stream.close()
+        elif self.stream is sys.stdout:
+            self.stream.flush()
+
+def _batches(items, size=BATCH_SIZE):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def read_paths(source, alphabet=WALL_STEPS):
+    """
+    Read paths in ragged batches from a corpus directory or an NDJSON file
+    ("-" for stdin) of {"steps": [...]} objects or plain step lists.
+    Yields:
+    - (codes, offsets): Ragged batches, see step_codes.pack_paths.
+    """
+    if os.path.isfile(os.path.join(source, META_FILE)):
+        corpus = PathCorpus(source)
+        if corpus.alphabet != tuple(alphabet):
+            raise SystemExit(f"{source} holds {corpus.alphabet} paths, expected {tuple(alphabet)}")
+        for _, codes, offsets in corpus.iter_batches():
+            yield codes, offsets
+        return
+    stream = sys.stdin if source == "-" else open(source)
+    try:
+        records = (json.loads(line) for line in stream if line.strip())
+        for batch in _batches(record["steps"] if isinstance(record, dict) else record for record in records):
+            yield pack_paths(batch, alphabet)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def _print_json(value):
+    print(json.dumps(value))
+
+def _parallel_map(function, tasks, workers):
+    """
+    Yield function(task) for every task, in task order. With more than one
+    worker the tasks run in a process pool with at most 2 * workers of them in
+    flight, so a long stream of tasks is read lazily.
+    """
+    if workers == 1:
+        yield from map(function, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _chunks(count, seed):
+    """
+    Split count random draws into BATCH_SIZE chunks, each with its own seed
+    sequence spawned from seed, so the output does not depend on the workers.
+    """
+    sizes = [min(BATCH_SIZE, count - first) for first in range(0, count, BATCH_SIZE)]
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+def _int_seed(sequence):
+    """Integer seed of the random module from a numpy seed sequence."""
+    return int(sequence.generate_state(1, np.uint64)[0])
+
+def _generate_chunk(task):
+    from .paths.fibonnaci_paths import generate_validated_path
+
+    rows, cols, size, sequence = task
+    # generate_validated_path draws from the random module
+    random.seed(_int_seed(sequence))
+    return pack_paths([generate_validated_path(rows, cols)[1] for _ in range(size)], WALL_STEPS)
+
+def _enumerate_shard(task):
+    from .paths.wall_enumeration import WallPathEnumerator
+
+    rows, cols, length, min_length, shard, num_shards, shard_depth = task
+    return pack_paths(list(WallPathEnumerator(rows, cols, length, min_length, shard, num_shards, shard_depth)),
+                      WALL_STEPS)
+
+def command_generate(args):
+    """
+    Random wall paths of generate_validated_path, or every path with --enumerate.
+    With --workers > 1 the enumeration is split into WallPathEnumerator shards,
+    and the paths come out shard after shard instead of in depth first order.
+    """
+    from .paths.parallel_counting import WallModel, choose_shard_depth
+    from .paths.wall_enumeration import iter_wall_paths
+
+    writer = PathWriter(args.output, args.format, WALL_STEPS)
+    if args.enumerate and args.workers == 1:
+        batches = (pack_paths(batch, WALL_STEPS)
+                   for batch in _batches(iter_wall_paths(args.rows, args.cols, args.length, args.min_length)))
+    elif args.enumerate:
+        num_shards = args.workers * 8
+        shard_depth = choose_shard_depth(WallModel(args.rows, args.cols), args.length, num_shards)
+        tasks = [(args.rows, args.cols, args.length, args.min_length, shard, num_shards, shard_depth)
+                 for shard in range(num_shards)]
+        batches = _parallel_map(_enumerate_shard, tasks, args.workers)
+    else:
+        tasks = [(args.rows, args.cols, size, sequence) for size, sequence in _chunks(args.count, args.seed)]
+        batches = _parallel_map(_generate_chunk, tasks, args.workers)
+    for codes, offsets in batches:
+        writer.write(codes, offsets)
+    writer.close()
+    return 0
+
+def _convert_batch(task):
+    to, codes, offsets = task
+    return (batch_phi if to == "dyck" else batch_psi)(codes, offsets)
+
+def command_convert(args):
+    """Wall paths to Dyck (phi) or Motzkin (psi) paths, batch by batch."""
+    writer = PathWriter(args.output, args.format, DYCK_STEPS if args.to == "dyck" else MOTZKIN_STEPS)
+    tasks = ((args.to, codes, offsets) for codes, offsets in read_paths(args.input))
+    for codes, offsets in _parallel_map(_convert_batch, tasks, args.workers):
+        writer.write(codes, offsets)
+    writer.close()
+    return 0
+
+def command_count(args):
+    """Exact numbers of paths by length for the walk models of parallel_counting."""
+    from .paths.parallel_counting import WallModel, HexModel, CubeWalkModel, parallel_count
+
+    if args.model == "wall":
+        model = WallModel(args.rows, args.cols)
+    elif args.model == "hex":
+        model = HexModel(args.rows, args.cols, self_avoiding=args.self_avoiding)
+    else:
+        model = CubeWalkModel(args.size)
+    counts, endpoints = parallel_count(model, args.length, workers=args.workers)
+    result = {"model": args.model, "length": args.length, "counts": counts}
+    if args.endpoints:
+        result["endpoints"] = [[list(point), count] for point, count in endpoints.items()]
+    _print_json(result)
+    return 0
+
+def _sample_wall_chunk(task):
+    from .paths.wall_sampling import UniformWallPathSampler
+
+    rows, cols, length, size, sequence = task
+    sampler = UniformWallPathSampler(rows, cols, length, seed=_int_seed(sequence))
+    return pack_paths([sampler.sample()[1] for _ in range(size)], WALL_STEPS)
+
+def _sample_dyck_chunk(task):
+    from .utils.randommixed import sample_dyck_paths
+
+    length, size, sequence = task
+    # +1 is U (code 0), -1 is D (code 1)
+    codes = (sample_dyck_paths(length // 2, size, np.random.default_rng(sequence)) < 0).astype(np.uint8)
+    return codes.reshape(-1), np.arange(size + 1, dtype=np.int64) * (2 * (length // 2))
+
+def _sample_walk_chunk(task):
+    from .paths.saw3d import simulate_walks
+
+    grid_size, length, size, sequence = task
+    return simulate_walks(grid_size, length, size, rng=np.random.default_rng(sequence))
+
+def command_sample(args):
+    """
+    Uniform wall or Dyck paths, or 3D self-avoiding walks as point lists.
+    The draws are made in chunks with seeds spawned from --seed, so a seeded
+    run gives the same paths for any number of workers.
+    """
+    chunks = _chunks(args.count, args.seed)
+    if args.kind == "wall":
+        writer = PathWriter(args.output, args.format, WALL_STEPS)
+        tasks = [(args.rows, args.cols, args.length, size, sequence) for size, sequence in chunks]
+        for codes, offsets in _parallel_map(_sample_wall_chunk, tasks, args.workers):
+            writer.write(codes, offsets)
+        writer.close()
+    elif args.kind == "dyck":
+        writer = PathWriter(args.output, args.format, DYCK_STEPS)
+        tasks = [(args.length, size, sequence) for size, sequence in chunks]
+        for codes, offsets in _parallel_map(_sample_dyck_chunk, tasks, args.workers):
+            writer.write(codes, offsets)
+        writer.close()
+    else:
+        from .paths.saw3d import STOP_REASONS, walk_points
+
+        if args.format == "corpus":
+            raise SystemExit("3D walks have six moves and cannot be stored in a 2-bit corpus")
+        stream = sys.stdout if args.output == "-" else open(args.output, "w")
+        tasks = [(args.size, args.length, size, sequence) for size, sequence in chunks]
+        for path_moves, lengths, reasons in _parallel_map(_sample_walk_chunk, tasks, args.workers):
+            points = walk_points(path_moves)
+            for walk, length, reason in zip(points, lengths, reasons):
+                record = {"points": walk[:length + 1].tolist(), "reason": STOP_REASONS[reason]}
+                stream.write(json.dumps(record) + "\n")
+        if stream is not sys.stdout:
+            stream.close()
+    return 0
+
+def command_render(args):
+    """Render the jobs of an NDJSON file, see render_pipeline for the job fields."""
+    from .visualization.render_pipeline import render_jobs
+
+    stream = sys.stdin if args.jobs == "-" else open(args.jobs)
+    with stream:
+        jobs = [json.loads(line) for line in stream if line.strip()]
+    for output in render_jobs(jobs, workers=args.workers):
+        print(output)
+    return 0
+
+def _timed(name, function, items=None):
+    """Run function once and print its time, and its rate if items is given."""
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    record = {"name": name, "seconds": round(seconds, 6)}
+    if items is not None:
+        record.update(items=items, items_per_second=round(items / seconds, 1) if seconds else None)
+    _print_json(record)
+
+def command_bench(args):
+    """Time the counting, sampling, conversion and walk engines on one size."""
+    from .paths.parallel_counting import WallModel, parallel_count
+    from .paths.saw3d import simulate_walks
+    from .paths.wall_counting import count_wall_paths
+    from .paths.wall_sampling import UniformWallPathSampler
+
+    rng = np.random.default_rng(args.seed)
+    lengths = rng.integers(0, 2 * args.length, args.count)
+    offsets = np.zeros(args.count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes = rng.integers(0, 4, offsets[-1]).astype(np.uint8)
+
+    # Items are the frontier cells advanced, the paths sampled, the steps converted
+    # or the walks grown; the depth first count has no natural unit and only a time
+    frontier_cells = args.length * 4 * args.rows * 2 * args.cols
+    _timed("count_wall_paths", lambda: count_wall_paths(args.rows, args.cols, args.length), frontier_cells)
+    _timed("parallel_count", lambda: parallel_count.uncached(WallModel(args.rows, args.cols), min(args.length, 12),
+                                                             workers=args.workers))
+    sampler = UniformWallPathSampler(args.rows, args.cols, args.length, seed=args.seed)
+    if sampler.total:
+        _timed("uniform_wall_sample", lambda: sampler.sample_many(1000), 1000)
+    _timed("batch_phi", lambda: batch_phi(codes, offsets), len(codes))
+    _timed("batch_psi", lambda: batch_psi(codes, offsets), len(codes))
+    _timed("simulate_walks", lambda: simulate_walks(20, 50, args.count, rng=args.seed), args.count)
+    return 0
+
+def _add_output(parser):
+    parser.add_argument("--output", "-o", default="-", help="File or corpus directory, - for stdout")
+    parser.add_argument("--format", choices=("ndjson", "corpus"), default="ndjson")
+
+def build_parser():
+    """Build the argument parser of all commands."""
+    parser = argparse.ArgumentParser(prog="python -m src", description="Wall, Dyck and Motzkin path tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="random or all wall paths")
+    generate.add_argument("--rows", type=int, default=6)
+    generate.add_argument("--cols", type=int, default=8)
+    generate.add_argument("--count", type=int, default=10, help="number of random paths")
+    generate.add_argument("--seed", type=int)
+    generate.add_argument("--enumerate", action="store_true", help="write every path instead")
+    generate.add_argument("--length", type=int, default=10, help="longest path with --enumerate")
+    generate.add_argument("--min-length", type=int, default=0, help="shortest path with --enumerate")
+    _add_output(generate)
+    generate.add_argument("--workers", type=int, default=1, help="number of processes")
+    generate.set_defaults(handler=command_generate)
+
+    convert = commands.add_parser("convert", help="wall paths to Dyck or Motzkin paths")
+    convert.add_argument("--to", choices=("dyck", "motzkin"), required=True)
+    convert.add_argument("--input", "-i", default="-", help="NDJSON file or corpus directory, - for stdin")
+    _add_output(convert)
+    convert.add_argument("--workers", type=int, default=1, help="number of processes")
+    convert.set_defaults(handler=command_convert)
+
+    count = commands.add_parser("count", help="exact path counts by length")
+    count.add_argument("--model", choices=("wall", "hex", "cube"), default="wall")
+    count.add_argument("--rows", type=int, default=6)
+    count.add_argument("--cols", type=int, default=8)
+    count.add_argument("--size", type=int, default=3, help="points per axis of the cube model")
+    count.add_argument("--length", type=int, default=10)
+    count.add_argument("--self-avoiding", action="store_true", help="self-avoiding hex paths")
+    count.add_argument("--endpoints", action="store_true", help="also list the end points of the longest paths")
+    count.add_argument("--workers", type=int)
+    count.set_defaults(handler=command_count)
+
+    sample = commands.add_parser("sample", help="uniform wall or Dyck paths, 3D self-avoiding walks")
+    sample.add_argument("--kind", choices=("wall", "dyck", "saw3d"), default="wall")
+    sample.add_argument("--rows", type=int, default=6)
+    sample.add_argument("--cols", type=int, default=8)
+    sample.add_argument("--size", type=int, default=20, help="points per axis of the 3D box")
+    sample.add_argument("--length", type=int, default=10, help="number of steps")
+    sample.add_argument("--count", type=int, default=10)
+    sample.add_argument("--seed", type=int)
+    _add_output(sample)
+    sample.add_argument("--workers", type=int, default=1, help="number of processes")
+    sample.set_defaults(handler=command_sample)
+
+    render = commands.add_parser("render", help="render an NDJSON file of jobs")
+    render.add_argument("--jobs", default="-", help="NDJSON file of render jobs, - for stdin")
+    render.add_argument("--workers", type=int)
+    render.set_defaults(handler=command_render)
+
+    bench = commands.add_parser("bench", help="time the computational core")
+    bench.add_argument("--rows", type=int, default=6)
+    bench.add_argument("--cols", type=int, default=8)
+    bench.add_argument("--length", type=int, default=20)
+    bench.add_argument("--count", type=int, default=10000)
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--workers", type=int)
+    bench.set_defaults(handler=command_bench)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # The reader of the output (head, a closed pipe) stopped early
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
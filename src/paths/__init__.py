@@ -0,0 +1,25 @@
+"""
+Wall paths: generation, counting, sampling and the transforms to Dyck and Motzkin paths.
+"""
+from .convert_to_dyck import iter_phi, phi, draw_brick_path, draw_dyck_path
+from .convert_to_motzkin import iter_psi, psi, draw_motzkin_path_fixed
+from .fibonnaci_paths import is_valid_move, generate_validated_path, draw_custom_wall_tiling_with_path
+from .step_codes import (
+    WALL_STEPS, DYCK_STEPS, MOTZKIN_STEPS, PAD,
+    encode_steps, decode_steps, pack_paths, unpack_paths, pack_padded, pad_paths, path_index,
+)
+from .batch_convert import batch_phi, batch_psi
+from .wall_counting import (
+    DIRECTIONS, legal_moves, iter_frontiers, count_wall_paths, count_wall_paths_by_endpoint,
+    completion_counts, longest_continuations,
+)
+from .wall_sampling import UniformWallPathSampler
+from .wall_enumeration import WallPathEnumerator, iter_wall_paths
+from .parallel_counting import WallModel, HexModel, CubeWalkModel, count_shard, parallel_count
+from .saw3d import POSITIVE_MOVES, COMPLETE, TRAPPED, STOP_REASONS, simulate_walks, walk_points, iter_walk_batches
+from .perm_sampler import PERMSampler
+from .wall_statistics import wall_statistics, width_area_histogram, decomposition_paths
+from .triangular_lattice import (
+    DIRECTIONS as TRIANGULAR_DIRECTIONS, to_cartesian, TriangularLatticePath, random_triangular_path,
+)
+from .path_corpus import PathCorpus, path_columns, write_corpus
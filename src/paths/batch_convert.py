@@ -0,0 +1,103 @@
+import numpy as np
+
+from .step_codes import N, S, E1, path_index
+
+# Dyck and Motzkin step codes (see DYCK_STEPS and MOTZKIN_STEPS)
+UP, DOWN, LEVEL = 0, 1, 2
+
+# Motzkin code of each wall step: N -> U, S -> D, E1/E2 -> H
+_MOTZKIN_OF_WALL = np.array([UP, DOWN, LEVEL, LEVEL], dtype=np.uint8)
+
+def _segment_sums(values, offsets):
+    """Sum an integer array over the ragged segments given by offsets."""
+    totals = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=totals[1:])
+    return totals[offsets[1:]] - totals[offsets[:-1]]
+
+def batch_phi(codes, offsets):
+    """
+    Convert many wall paths to Dyck paths at once, equivalent to phi on each path.
+    Args:
+    - codes (np.ndarray): uint8 wall step codes of all paths (see step_codes).
+    - offsets (np.ndarray): Path boundaries, path i is codes[offsets[i]:offsets[i + 1]].
+    Returns:
+    - dyck_codes (np.ndarray): uint8 Dyck step codes (U = 0, D = 1).
+    - dyck_offsets (np.ndarray): Boundaries of the Dyck paths.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    owner = path_index(offsets)
+
+    # Only N and S survive, and their codes coincide with U and D
+    vertical = codes <= S
+    kept = _segment_sums(vertical, offsets)
+
+    dyck_offsets = np.zeros(len(offsets), dtype=np.int64)
+    np.cumsum(kept + 2, out=dyck_offsets[1:])
+    dyck = np.empty(dyck_offsets[-1], dtype=np.uint8)
+
+    # Every earlier path adds its two closing steps in front of the body steps
+    body_owner = owner[vertical]
+    dyck[np.arange(len(body_owner)) + 2 * body_owner] = codes[vertical]
+    dyck[dyck_offsets[1:] - 2] = UP
+    dyck[dyck_offsets[1:] - 1] = DOWN
+    return dyck, dyck_offsets
+
+def batch_psi(codes, offsets):
+    """
+    Convert many wall paths to Motzkin paths at once, equivalent to psi on each path.
+    The first "N", "E1" pair between two consecutive "S" steps opens a block that
+    the next "S" closes: the "E1" disappears and the "S" becomes "H", "D".
+    Args:
+    - codes (np.ndarray): uint8 wall step codes of all paths (see step_codes).
+    - offsets (np.ndarray): Path boundaries, path i is codes[offsets[i]:offsets[i + 1]].
+    Returns:
+    - motzkin_codes (np.ndarray): uint8 Motzkin step codes (U = 0, D = 1, H = 2).
+    - motzkin_offsets (np.ndarray): Boundaries of the Motzkin paths.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n_steps = len(codes)
+    owner = path_index(offsets)
+    is_south = codes == S
+
+    # Split every path into blocks that end right after an S step
+    block_start = np.zeros(n_steps, dtype=bool)
+    block_start[offsets[:-1][np.diff(offsets) > 0]] = True
+    block_start[1:] |= is_south[:-1]
+    block = np.cumsum(block_start) - 1
+    south_positions = np.flatnonzero(is_south)
+    closer_of_block = np.full(int(block[-1]) + 1 if n_steps else 0, -1, dtype=np.int64)
+    closer_of_block[block[south_positions]] = south_positions
+
+    # N, E1 pairs inside one path whose block is closed by an S
+    pair = np.zeros(n_steps, dtype=bool)
+    pair[:-1] = (codes[:-1] == N) & (codes[1:] == E1) & (owner[:-1] == owner[1:])
+    pair &= closer_of_block[block] >= 0
+    candidates = np.flatnonzero(pair)
+    first = np.ones(len(candidates), dtype=bool)
+    first[1:] = block[candidates[1:]] != block[candidates[:-1]]
+    openers = candidates[first]
+    closers = closer_of_block[block[openers]]
+
+    # Number of Motzkin steps each wall step turns into
+    counts = np.ones(n_steps, dtype=np.int64)
+    counts[openers + 1] = 0
+    counts[closers] = 2
+    symbols = _MOTZKIN_OF_WALL[codes]
+    symbols[closers] = LEVEL
+
+    body_lengths = _segment_sums(counts, offsets)
+    motzkin_offsets = np.zeros(len(offsets), dtype=np.int64)
+    np.cumsum(body_lengths + 1, out=motzkin_offsets[1:])
+    motzkin = np.full(motzkin_offsets[-1], LEVEL, dtype=np.uint8)
+
+    # Expand the steps, the second step of a closer is its D
+    source = np.repeat(np.arange(n_steps), counts)
+    run_start = np.cumsum(counts) - counts
+    second = np.arange(len(source)) > run_start[source]
+    body = np.where(second, DOWN, symbols[source]).astype(np.uint8)
+
+    # Every earlier path adds its closing H in front of the body steps
+    motzkin[np.arange(len(source)) + owner[source]] = body
+    return motzkin, motzkin_offsets
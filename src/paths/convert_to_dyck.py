@@ -1,28 +1,4 @@
-import matplotlib.pyplot as plt
-
-# Function for drawing the brick pattern
-def draw_wall_tiling(rows, cols, ax=None):
-    """
-    Create a grid to match the drawn brick pattern.
-    """
-    if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Create the brick pattern like a pathwall.pdf
-    for i in range(rows):
-        for j in range(cols):
-            # Adjusting the horizontal position of bricks (alternative alignment)
-            x_start = j * 2 if i % 2 == 0 else j * 2 + 1
-            rect = plt.Rectangle((x_start, i), 2, 1, edgecolor='black', facecolor='none')
-            ax.add_patch(rect)
-
-    # Axis limits and style
-    ax.set_xlim(0, cols * 2)
-    ax.set_ylim(0, rows)
-    ax.set_aspect('equal', adjustable='box')
-    ax.set_xticks([])
-    ax.set_yticks([])
-    return ax
+from ..visualization.wall_renderer import draw_wall_tiling
 
 # Drawing the path in a brick pattern
 def draw_brick_path(path, rows, cols, ax=None):
@@ -30,6 +6,7 @@ def draw_brick_path(path, rows, cols, ax=None):
     Çizilen tuğla deseninde verilen yolu göster.
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 5))
     
     draw_wall_tiling(rows, cols, ax=ax)
@@ -53,21 +30,28 @@ def draw_brick_path(path, rows, cols, ax=None):
     ax.set_title("Brick Pattern Path")
     return ax
 
-# Recursive Dyck path transformation
+# Streaming Dyck path transformation
+def iter_phi(P):
+    """
+    Yield the Dyck steps of a wall path one at a time.
+    Accepts any iterable of steps and runs in a single pass without recursion.
+    """
+    for step in P:
+        if step == "N":
+            yield "U"
+        elif step == "S":
+            yield "D"
+        # Horizontal and unrecognized steps are skipped in the Dyck way
+    # The empty road closes with a single peak
+    yield "U"
+    yield "D"
+
+# Dyck path transformation
 def phi(P):
     """
-    Rekürsif olarak Dyck yoluna dönüştür.
+    Dyck yoluna dönüştür.
     """
-    if not P:  # Empty road
-        return ["U", "D"]
-    elif P[0] == "E2":
-        return phi(P[1:])  # Horizontal steps are skipped Dyck way
-    elif P[0] == "N":
-        return ["U"] + phi(P[1:])
-    elif P[0] == "S":
-        return ["D"] + phi(P[1:])
-    else:
-        return phi(P[1:])  # Skip steps that are not valid
+    return list(iter_phi(P))
 
 # Don't draw the Dyck way
 def draw_dyck_path(path, ax=None):
@@ -75,6 +59,7 @@ def draw_dyck_path(path, ax=None):
     Dyck yolunu kare gridde çiz.
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 5))
     
     x, y = 0, 0
@@ -102,18 +87,24 @@ def generate_complex_brick_path():
     """
     return ["E2", "N", "E2", "S", "E2", "N", "E1", "N", "E2", "E1", "N", "E1", "N", "E2", "S", "E2", "S", "E2", "S","E2","S"]
 
-# Create complex brick path and Dyck path
-complex_brick_path = generate_complex_brick_path()
-dyck_path = phi(complex_brick_path)
+def main():
+    import matplotlib.pyplot as plt
+
+    # Create complex brick path and Dyck path
+    complex_brick_path = generate_complex_brick_path()
+    dyck_path = phi(complex_brick_path)
+
+    # for chart area
+    fig, axes = plt.subplots(1, 2, figsize=(14, 7))
 
-# for chart area
-fig, axes = plt.subplots(1, 2, figsize=(14, 7))
+    # Draw the brick path
+    draw_brick_path(complex_brick_path, rows=6, cols=10, ax=axes[0])
 
-# Draw the brick path
-draw_brick_path(complex_brick_path, rows=6, cols=10, ax=axes[0])
+    # draw the dyck path
+    draw_dyck_path(dyck_path, ax=axes[1])
 
-# draw the dyck path
-draw_dyck_path(dyck_path, ax=axes[1])
+    plt.tight_layout()
+    plt.show()
 
-plt.tight_layout()
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,60 @@
-import matplotlib.pyplot as plt
+from ..visualization.wall_renderer import draw_wall_tiling
 
-# Recursive Motzkin path transformation
+# Streaming Motzkin path transformation
+def iter_psi(P):
+    """
+    Yield the Motzkin steps of a wall path one at a time.
+    Accepts any iterable of steps and runs in a single pass without recursion.
+    An "N", "E1" pair opens a block that is closed by the next "S"; the steps
+    inside the block are held back until that "S" (or the end of the road) is seen.
+    """
+    pending_n = False  # Previous step was an "N" waiting for its successor
+    block = None       # Motzkin steps of an open "N", "E1" block
+    for step in P:
+        if block is not None:
+            if step == "S":
+                # Closed block: U, inner steps, the inner road's H, then D
+                yield "U"
+                yield from block
+                yield "H"
+                yield "D"
+                block = None
+            elif step == "N":
+                block.append("U")
+            elif step == "E1" or step == "E2":
+                block.append("H")
+            continue
+
+        if pending_n:
+            pending_n = False
+            if step == "E1":
+                block = []
+                continue
+            yield "U"
+
+        if step == "N":
+            pending_n = True
+        elif step == "S":
+            yield "D"
+        elif step == "E1" or step == "E2":
+            yield "H"  # Include E1 as horizontal step
+        # Skip unrecognized steps
+
+    if pending_n:
+        yield "U"
+    if block is not None:
+        # No "S" followed the pair, so the "E1" stays a plain horizontal step
+        yield "U"
+        yield "H"
+        yield from block
+    yield "H"  # Horizontal step for space in Motzkin
+
+# Motzkin path transformation
 def psi(P):
     """
-    Recursively return to the Motzkin road.
+    Return the Motzkin road of a wall path.
     """
-    if not P:  # Empty road
-        return ["H"]  # Horizontal step for space in Motzkin
-    elif P[0] == "E2":
-        return ["H"] + psi(P[1:])  # Horizontal step
-    elif P[0] == "N":
-        if len(P) > 1 and P[1] == "E1" and "S" in P[2:]:
-            S_index = P[2:].index("S") + 2  # To find the correct index
-            return ["U"] + psi(P[2:S_index]) + ["D"] + psi(P[S_index+1:])
-        else:
-            return ["U"] + psi(P[1:])
-    elif P[0] == "S":
-        return ["D"] + psi(P[1:])
-    elif P[0] == "E1":
-        return ["H"] + psi(P[1:])  # Include E1 as horizontal step
-    else:
-        return psi(P[1:])  # Skip unrecognized steps
+    return list(iter_psi(P))
 
 # Drawing the Motzkin path with diagonal movements and fixed ending
 def draw_motzkin_path_fixed(path, ax=None):
@@ -28,6 +62,7 @@ def draw_motzkin_path_fixed(path, ax=None):
     Motzkin yolunu kare gridde eğik adımlarla ve düzgün sona kesilerek çiz.
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 5))
     
     x, y = 0, 0
@@ -60,36 +95,13 @@ def draw_motzkin_path_fixed(path, ax=None):
     ax.axhline(0, color='black', linewidth=0.8, linestyle='--')
     return ax
 
-# Function for drawing the brick pattern
-def draw_wall_tiling(rows, cols, ax=None):
-    """
-    Create a grid to match the drawn brick pattern.
-    """
-    if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Create the brick pattern like a pathwall.pdf
-    for i in range(rows):
-        for j in range(cols):
-            # Adjusting the horizontal position of bricks (alternative alignment)
-            x_start = j * 2 if i % 2 == 0 else j * 2 + 1
-            rect = plt.Rectangle((x_start, i), 2, 1, edgecolor='black', facecolor='none')
-            ax.add_patch(rect)
-
-    # Axis limits and style
-    ax.set_xlim(0, cols * 2)
-    ax.set_ylim(0, rows)
-    ax.set_aspect('equal', adjustable='box')
-    ax.set_xticks([])
-    ax.set_yticks([])
-    return ax
-
 # Drawing the path in a brick pattern
 def draw_brick_path(path, rows, cols, ax=None):
     """
     Çizilen tuğla deseninde verilen yolu göster.
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 5))
     
     draw_wall_tiling(rows, cols, ax=ax)
@@ -120,16 +132,22 @@ def generate_complex_brick_path():
     """
     return ["E2", "N", "E2", "S", "E2", "N", "E1", "N", "E2", "E1", "N", "E1", "N", "E2", "S", "E2", "S", "E2", "S", "E2", "S"]
 
-# Generate a complex brick path
-complex_brick_path = generate_complex_brick_path()
+def main():
+    import matplotlib.pyplot as plt
+
+    # Generate a complex brick path
+    complex_brick_path = generate_complex_brick_path()
+
+    # Create Motzkin path from the complex brick path
+    motzkin_path = psi(complex_brick_path)
 
-# Create Motzkin path from the complex brick path
-motzkin_path = psi(complex_brick_path)
+    # Plot both the brick path and Motzkin path
+    fig, axes = plt.subplots(1, 2, figsize=(14, 7))
+    draw_brick_path(complex_brick_path, rows=6, cols=10, ax=axes[0])
+    draw_motzkin_path_fixed(motzkin_path, ax=axes[1])
 
-# Plot both the brick path and Motzkin path
-fig, axes = plt.subplots(1, 2, figsize=(14, 7))
-draw_brick_path(complex_brick_path, rows=6, cols=10, ax=axes[0])
-draw_motzkin_path_fixed(motzkin_path, ax=axes[1])
+    plt.tight_layout()
+    plt.show()
 
-plt.tight_layout()
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
-import matplotlib.pyplot as plt
 import random
 
+from ..visualization.wall_renderer import draw_wall_tiling
+
 def draw_custom_wall_tiling_with_path(rows, cols, path):
     """
     Draw a custom wall tiling with E1, E2 and visualize a path.
@@ -9,26 +10,21 @@ def draw_custom_wall_tiling_with_path(rows, cols, path):
     - cols (int): Number of columns in the grid.
     - path (list of tuples): The path to visualize.
     """
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10, 5))
     
     # Draw the custom wall tiling
-    for i in range(rows):
-        for j in range(cols):
-            x_start = 2 * j if i % 2 == 0 else 2 * j + 1
-            rect = plt.Rectangle((x_start, i), 2, 1, edgecolor='black', facecolor='none')
-            ax.add_patch(rect)
+    draw_wall_tiling(rows, cols, ax=ax)
     
     # Draw the path
     if path:
         x, y = zip(*path)
         ax.plot(x, y, color='red', linewidth=2, marker='o', label="Path")
 
-    # Set limits and aspect ratio
+    # Set limits with a margin around the wall
     ax.set_xlim(-1, cols * 2 + 1)
     ax.set_ylim(-1, rows + 1)
-    ax.set_aspect('equal', adjustable='box')
-    ax.set_xticks([])
-    ax.set_yticks([])
     ax.set_title("Fibonacci Paths on Wall of $N^2$")
     ax.legend()
     plt.show()
@@ -110,12 +106,16 @@ def generate_validated_path(rows, cols):
 
     return path, moves
 
-# Example usage
-rows = 6
-cols = 8
+def main():
+    # Example usage
+    rows = 6
+    cols = 8
+
+    # Generate the path with strict direction validation
+    validated_path, moves = generate_validated_path(rows, cols)
 
-# Generate the path with strict direction validation
-validated_path, moves = generate_validated_path(rows, cols)
+    # Draw the grid with the generated path
+    draw_custom_wall_tiling_with_path(rows, cols, validated_path)
 
-# Draw the grid with the generated path
-draw_custom_wall_tiling_with_path(rows, cols, validated_path)
+if __name__ == "__main__":
+    main()
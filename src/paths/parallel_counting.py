@@ -0,0 +1,192 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from ..utils.result_cache import cached
+from .wall_counting import DIRECTIONS, _check_grid, legal_moves
+
+# Moves of generate_hexagonal_paths in altıgenUcgenGridMove.py
+HEX_MOVES = [(1, 0), (-1, 0), (1, -1), (-1, -1), (1, 1), (-1, 1)]
+
+# Direct neighbours of generate_3d_path in 3dGridwithPath.py
+CUBE_MOVES = [(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)]
+
+class WallModel:
+    """Fibonacci wall paths, the rules of is_valid_move. A state is (x, y, last move)."""
+    self_avoiding = False  # Implied by the rules, see legal_moves
+
+    def __init__(self, rows, cols):
+        _check_grid(rows, cols)
+        self.rows = rows
+        self.cols = cols
+
+    def root(self):
+        return (0, 0, None)
+
+    def successors(self, state):
+        x, y, last_move = state
+        for move in legal_moves(x, y, last_move, self.rows, self.cols):
+            dx, dy = DIRECTIONS[move]
+            yield (x + dx, y + dy, move)
+
+    def position(self, state):
+        return state[:2]
+
+class HexModel:
+    """Paths of generate_hexagonal_paths. A state is the position (x, y)."""
+    def __init__(self, rows, cols, start=(0, 0), self_avoiding=False):
+        self.rows = rows
+        self.cols = cols
+        self.start = tuple(start)
+        self.self_avoiding = self_avoiding
+
+    def root(self):
+        return self.start
+
+    def successors(self, state):
+        x, y = state
+        for dx, dy in HEX_MOVES:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                yield (nx, ny)
+
+    def position(self, state):
+        return state
+
+class CubeWalkModel:
+    """Self-avoiding walks of generate_3d_path in a grid_size^3 box, from (0, 0, 0)."""
+    self_avoiding = True
+
+    def __init__(self, grid_size, moves=CUBE_MOVES):
+        self.grid_size = grid_size
+        self.moves = list(moves)
+
+    def root(self):
+        return (0, 0, 0)
+
+    def successors(self, state):
+        x, y, z = state
+        size = self.grid_size
+        for dx, dy, dz in self.moves:
+            nx, ny, nz = x + dx, y + dy, z + dz
+            if 0 <= nx < size and 0 <= ny < size and 0 <= nz < size:
+                yield (nx, ny, nz)
+
+    def position(self, state):
+        return state
+
+def count_shard(model, max_length, shard=0, num_shards=1, shard_depth=1):
+    """
+    Count the paths of one shard of the search tree without storing them.
+    The subtrees below the paths with shard_depth moves are dealt out round
+    robin to the shards; the shorter paths are counted by shard 0.
+    Args:
+    - model: Walk model (WallModel, HexModel or CubeWalkModel).
+    - max_length (int): Longest path length (number of moves) to count.
+    - shard, num_shards (int): This shard and the total number of shards.
+    - shard_depth (int): Length of the prefixes dealt out to the shards.
+    Returns:
+    - counts (list of int): counts[n] is the number of paths with n moves.
+    - endpoints (Counter): End points of the paths with max_length moves.
+    """
+    counts = [0] * (max_length + 1)
+    endpoints = Counter()
+    root = model.root()
+    if shard == 0:
+        counts[0] += 1
+        if max_length == 0:
+            endpoints[model.position(root)] += 1
+    if max_length == 0:
+        return counts, endpoints
+
+    visited = {model.position(root)} if model.self_avoiding else None
+    prefix_count = 0
+    states = [root]
+    branches = [iter(model.successors(root))]
+    while branches:
+        state = next(branches[-1], None)
+        if state is None:
+            branches.pop()
+            left = states.pop()
+            if visited is not None and states:
+                visited.discard(model.position(left))
+            continue
+
+        position = model.position(state)
+        if visited is not None and position in visited:
+            continue
+        depth = len(branches)
+        if depth == shard_depth:
+            prefix = prefix_count
+            prefix_count += 1
+            if prefix % num_shards != shard:
+                continue
+
+        if depth >= shard_depth or shard == 0:
+            counts[depth] += 1
+            if depth == max_length:
+                endpoints[position] += 1
+        if depth < max_length:
+            states.append(state)
+            branches.append(iter(model.successors(state)))
+            if visited is not None:
+                visited.add(position)
+    return counts, endpoints
+
+def _count_shard_task(task):
+    """Process pool entry point, unpacks the arguments of count_shard."""
+    return count_shard(*task)
+
+def choose_shard_depth(model, max_length, num_shards):
+    """
+    Pick the shallowest prefix length that gives every shard a few prefixes.
+    """
+    depth = 1
+    while depth < max_length:
+        counts, _ = count_shard(model, depth)
+        if counts[depth] >= 4 * num_shards:
+            break
+        depth += 1
+    return depth
+
+@cached(ignore=('workers', 'shards_per_worker', 'shard_depth'), depends=('.wall_counting',))
+def parallel_count(model, max_length, workers=None, shards_per_worker=8, shard_depth=None):
+    """
+    Count paths by length and end point on all cores.
+    The search tree is split by prefix into shards_per_worker * workers shards;
+    only the per-shard histograms travel between processes, and they are merged
+    in shard order so the result does not depend on scheduling, which also lets
+    the result be kept in the on-disk result cache.
+    Args:
+    - model: Walk model (WallModel, HexModel or CubeWalkModel).
+    - max_length (int): Longest path length (number of moves) to count.
+    - workers (int): Number of processes, all cores if None, 1 runs in-process.
+    - shards_per_worker (int): Shards per process, for load balancing.
+    - shard_depth (int): Prefix length used for the split, chosen automatically if None.
+    Returns:
+    - counts (list of int): counts[n] is the number of paths with n moves.
+    - endpoints (dict): End point -> number of paths with max_length moves, sorted by end point.
+    """
+    workers = workers or os.cpu_count() or 1
+    num_shards = workers * shards_per_worker if workers > 1 else 1
+    if shard_depth is None:
+        shard_depth = choose_shard_depth(model, max_length, num_shards) if num_shards > 1 else 1
+    tasks = [(model, max_length, shard, num_shards, shard_depth) for shard in range(num_shards)]
+
+    if workers == 1:
+        results = map(_count_shard_task, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_count_shard_task, tasks)
+
+    counts = [0] * (max_length + 1)
+    endpoints = Counter()
+    try:
+        for shard_counts, shard_endpoints in results:
+            for length, count in enumerate(shard_counts):
+                counts[length] += count
+            endpoints.update(shard_endpoints)
+    finally:
+        if workers > 1:
+            executor.shutdown()
+    return counts, dict(sorted(endpoints.items()))
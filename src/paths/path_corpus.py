@@ -0,0 +1,272 @@
+import json
+import os
+
+import numpy as np
+
+from .batch_convert import _segment_sums
+from .step_codes import WALL_STEPS, DYCK_STEPS, MOTZKIN_STEPS, pack_paths, decode_steps
+from .wall_statistics import wall_statistics
+
+# A corpus is a directory with
+#     meta.json         alphabet, number of paths and steps, metric columns
+#     steps.bin         step codes, 2 bits each, four steps per byte, first step in the low bits
+#     offsets.bin       int64, path i is steps offsets[i] ... offsets[i + 1] - 1
+#     <column>.col      one value per path for every metric column
+# Appends write the data files first and meta.json last, so a reader only ever
+# sees the paths that were completely written.
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+STEPS_FILE = "steps.bin"
+OFFSETS_FILE = "offsets.bin"
+COLUMN_SUFFIX = ".col"
+
+_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+# Height change of every step, for the columns of Dyck and Motzkin corpora
+_HEIGHT_STEPS = {DYCK_STEPS: np.array([1, -1], dtype=np.int64), MOTZKIN_STEPS: np.array([1, -1, 0], dtype=np.int64)}
+
+def path_columns(codes, offsets, alphabet=WALL_STEPS):
+    """
+    Default metric columns of a batch of paths.
+    Wall paths get the wall_statistics columns; Dyck and Motzkin paths their
+    number of steps, final and highest height; other alphabets only steps.
+    Returns:
+    - dict of np.ndarray: One int64 value per path for every column.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if tuple(alphabet) == WALL_STEPS:
+        return wall_statistics(codes, offsets)
+    columns = {'steps': np.diff(offsets)}
+    dy_table = _HEIGHT_STEPS.get(tuple(alphabet))
+    if dy_table is not None:
+        dy = dy_table[np.asarray(codes)]
+        heights = np.cumsum(dy)
+        starts = offsets[:-1]
+        before = np.concatenate(([0], heights))
+        max_height = np.zeros(len(starts), dtype=np.int64)
+        nonempty = columns['steps'] > 0
+        if nonempty.any():
+            highest = np.maximum.reduceat(heights, starts[nonempty]) - before[starts[nonempty]]
+            max_height[nonempty] = np.maximum(highest, 0)
+        columns['final_height'] = _segment_sums(dy, offsets)
+        columns['max_height'] = max_height
+    return columns
+
+def _pack_codes(codes, skip=0, first_byte=0):
+    """
+    Pack 2-bit codes four to a byte, starting skip codes into the first byte,
+    whose earlier codes are taken from first_byte.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    padded = np.zeros(-(-(skip + len(codes)) // 4) * 4, dtype=np.uint8)
+    padded[:skip] = (first_byte >> _SHIFTS[:skip]) & 3
+    padded[skip:skip + len(codes)] = codes
+    return np.bitwise_or.reduce(padded.reshape(-1, 4) << _SHIFTS, axis=1).astype(np.uint8)
+
+def _unpack_codes(packed, start, count):
+    """Codes start ... start + count - 1 of a packed byte array."""
+    first = start // 4
+    data = np.asarray(packed[first:-(-(start + count) // 4)])
+    codes = ((data[:, None] >> _SHIFTS) & 3).reshape(-1)
+    return codes[start - 4 * first:start - 4 * first + count]
+
+class PathCorpus:
+    """
+    On-disk corpus of step paths that is read through memory maps, so corpora
+    much larger than the memory can be appended to, indexed and scanned.
+    """
+    def __init__(self, directory):
+        """
+        Open an existing corpus, see create for a new one.
+        """
+        self.directory = directory
+        with open(self._file(META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus version {meta.get('version')} in {directory}")
+        self.alphabet = tuple(meta["alphabet"])
+        self.num_paths = meta["paths"]
+        self.num_steps = meta["steps"]
+        self.column_types = dict(meta["columns"])
+        self._maps = {}
+
+    @classmethod
+    def create(cls, directory, alphabet=WALL_STEPS, columns=None):
+        """
+        Create an empty corpus.
+        Args:
+        - directory (str): Directory of the corpus, created if needed, must not hold a corpus.
+        - alphabet (tuple of str): Step alphabet, at most four steps.
+        - columns (dict): Metric column name -> numpy dtype; the path_columns of
+          the alphabet (as int64) if None.
+        Returns:
+        - PathCorpus: The open corpus.
+        """
+        alphabet = tuple(alphabet)
+        if len(alphabet) > 4:
+            raise ValueError(f"Steps are stored in 2 bits, the alphabet {alphabet} is too large")
+        if columns is None:
+            columns = {name: "int64" for name in path_columns(np.zeros(0, dtype=np.uint8), [0], alphabet)}
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, META_FILE)):
+            raise FileExistsError(f"{directory} already holds a corpus")
+        for name in [STEPS_FILE, OFFSETS_FILE] + [name + COLUMN_SUFFIX for name in columns]:
+            open(os.path.join(directory, name), "wb").close()
+        with open(os.path.join(directory, OFFSETS_FILE), "wb") as offsets_file:
+            offsets_file.write(np.zeros(1, dtype=np.int64).tobytes())
+        corpus = cls.__new__(cls)
+        corpus.directory = directory
+        corpus.alphabet = alphabet
+        corpus.num_paths = 0
+        corpus.num_steps = 0
+        corpus.column_types = {name: np.dtype(dtype).str for name, dtype in columns.items()}
+        corpus._maps = {}
+        corpus._write_meta()
+        return corpus
+
+    def _file(self, name):
+        return os.path.join(self.directory, name)
+
+    def _write_meta(self):
+        meta = {
+            "version": FORMAT_VERSION,
+            "alphabet": list(self.alphabet),
+            "paths": self.num_paths,
+            "steps": self.num_steps,
+            "columns": self.column_types,
+        }
+        temporary = self._file(META_FILE + ".tmp")
+        with open(temporary, "w") as meta_file:
+            json.dump(meta, meta_file, indent=2)
+        os.replace(temporary, self._file(META_FILE))
+
+    def _map(self, name, dtype, length):
+        """Read-only memory map of the first length items of a data file, reused until it grows."""
+        cached = self._maps.get(name)
+        if cached is not None and len(cached) >= length:
+            return cached[:length]
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        self._maps[name] = np.memmap(self._file(name), dtype=dtype, mode="r", shape=(length,))
+        return self._maps[name]
+
+    @property
+    def packed_steps(self):
+        """The packed step bytes, memory-mapped."""
+        return self._map(STEPS_FILE, np.uint8, -(-self.num_steps // 4))
+
+    @property
+    def offsets(self):
+        """The int64 path offsets, memory-mapped."""
+        return self._map(OFFSETS_FILE, np.int64, self.num_paths + 1)
+
+    def column(self, name):
+        """One metric column, memory-mapped."""
+        return self._map(name + COLUMN_SUFFIX, np.dtype(self.column_types[name]), self.num_paths)
+
+    def __len__(self):
+        return self.num_paths
+
+    def append(self, codes, offsets, columns=None):
+        """
+        Append a ragged batch of paths.
+        Args:
+        - codes (np.ndarray): Step codes of all paths, one after another.
+        - offsets (np.ndarray): Path boundaries of the batch, starting at 0.
+        - columns (dict): Metric values of the batch, computed with path_columns if None.
+        """
+        codes = np.asarray(codes, dtype=np.uint8)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if len(codes) and codes.max() >= len(self.alphabet):
+            raise ValueError(f"Step code {codes.max()} is outside the alphabet {self.alphabet}")
+        if offsets[0] != 0 or offsets[-1] != len(codes):
+            raise ValueError("Offsets must run from 0 to the number of codes")
+        if columns is None:
+            columns = path_columns(codes, offsets, self.alphabet)
+        missing = set(self.column_types) - set(columns)
+        if missing:
+            raise ValueError(f"Missing metric columns {sorted(missing)}")
+
+        # The last byte may hold the first codes of the batch, it is rewritten
+        skip = self.num_steps % 4
+        first_byte = int(self.packed_steps[-1]) if skip else 0
+        with open(self._file(STEPS_FILE), "r+b") as steps_file:
+            steps_file.seek(self.num_steps // 4)
+            steps_file.write(_pack_codes(codes, skip, first_byte).tobytes())
+            steps_file.truncate()
+        with open(self._file(OFFSETS_FILE), "r+b") as offsets_file:
+            offsets_file.seek((self.num_paths + 1) * 8)
+            offsets_file.write((offsets[1:] + self.num_steps).tobytes())
+            offsets_file.truncate()
+        for name, dtype in self.column_types.items():
+            with open(self._file(name + COLUMN_SUFFIX), "r+b") as column_file:
+                column_file.seek(self.num_paths * np.dtype(dtype).itemsize)
+                column_file.write(np.asarray(columns[name], dtype=dtype).tobytes())
+                column_file.truncate()
+
+        self.num_paths += len(offsets) - 1
+        self.num_steps += len(codes)
+        self._maps.clear()
+        self._write_meta()
+
+    def append_paths(self, paths):
+        """Append paths given as lists of step strings."""
+        self.append(*pack_paths(paths, self.alphabet))
+
+    def codes(self, index):
+        """Step codes of path index, as a uint8 array."""
+        if not -self.num_paths <= index < self.num_paths:
+            raise IndexError(f"Path {index} is out of range for {self.num_paths} paths")
+        index %= self.num_paths
+        start, stop = (int(value) for value in self.offsets[index:index + 2])
+        return _unpack_codes(self.packed_steps, start, stop - start)
+
+    def __getitem__(self, index):
+        """Path index as a list of step strings."""
+        return decode_steps(self.codes(index), self.alphabet)
+
+    def batch(self, start, stop):
+        """
+        Paths start ... stop - 1 as a ragged batch.
+        Returns:
+        - codes, offsets: See step_codes.pack_paths, offsets start at 0.
+        """
+        start, stop, _ = slice(start, stop).indices(self.num_paths)
+        stop = max(stop, start)
+        offsets = np.array(self.offsets[start:stop + 1])
+        codes = _unpack_codes(self.packed_steps, int(offsets[0]), int(offsets[-1] - offsets[0]))
+        return codes, offsets - offsets[0]
+
+    def iter_batches(self, max_steps=1 << 24):
+        """
+        Scan the corpus in ragged batches of whole paths with about max_steps
+        steps each (a single longer path makes its own batch).
+        Yields:
+        - (first, codes, offsets): Index of the first path of the batch and the batch.
+        """
+        offsets = self.offsets
+        start = 0
+        while start < self.num_paths:
+            limit = offsets[start] + max_steps
+            stop = int(np.searchsorted(offsets, limit, side="right")) - 1
+            stop = min(max(stop, start + 1), self.num_paths)
+            codes, batch_offsets = self.batch(start, stop)
+            yield start, codes, batch_offsets
+            start = stop
+
+def write_corpus(directory, paths, alphabet=WALL_STEPS, batch_size=100000):
+    """
+    Write an iterable of step lists to a new corpus, batch_size paths at a time.
+    Returns:
+    - PathCorpus: The open corpus.
+    """
+    corpus = PathCorpus.create(directory, alphabet)
+    batch = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) == batch_size:
+            corpus.append_paths(batch)
+            batch = []
+    if batch:
+        corpus.append_paths(batch)
+    return corpus
@@ -0,0 +1,143 @@
+import random
+
+import numpy as np
+
+from .parallel_counting import CUBE_MOVES
+
+class PERMSampler:
+    """
+    Pruned-enriched Rosenbluth method (PERM) for self-avoiding walks in the
+    grid_size^3 box, with the bounds and moves of generate_3d_path.
+    A tour grows walks depth first from the start. Every step goes to a uniformly
+    chosen free neighbour and multiplies the weight of the walk by the number of
+    free neighbours, so the weights of the walks of length n add up to an unbiased
+    estimate of the number c_n of walks. A walk whose weight is far above the
+    current estimate of c_n is enriched, it continues as two copies with half the
+    weight each. A walk far below it is pruned, it stops with probability 1/2 and
+    otherwise continues with twice the weight. Both keep the estimate unbiased
+    while spending the time on the walks that matter. Tours are independent, so
+    the spread of the per-tour sums gives the error bars.
+    Weights are stored divided by scale^n, scale = len(moves) - 1, so that they
+    stay in floating point range for long walks; only ratios of weights matter.
+    """
+    def __init__(self, grid_size, max_length, moves=CUBE_MOVES, start=(0, 0, 0), upper=3.0, lower=1 / 3, seed=None):
+        """
+        Args:
+        - grid_size (int): Points per axis, coordinates run over 0 ... grid_size - 1.
+        - max_length (int): Length (number of steps) of the sampled walks.
+        - moves (list of tuple): Unit moves of the walk.
+        - start (tuple): Starting point.
+        - upper, lower (float): Enrichment and pruning thresholds, relative to the
+          current estimate of c_n.
+        - seed: Seed of the random number generator.
+        """
+        self.grid_size = grid_size
+        self.max_length = max_length
+        self.moves = [tuple(move) for move in moves]
+        self.start = tuple(start)
+        if not all(0 <= c < grid_size for c in self.start):
+            raise ValueError(f"Start {self.start} is outside the {grid_size}^3 box")
+        self.upper = upper
+        self.lower = lower
+        self.scale = max(len(self.moves) - 1, 1)
+        self.random = random.Random(seed)
+        self.tours = 0
+        self.sums = np.zeros(max_length + 1)     # Sum over the tours of the per-tour sums
+        self.squares = np.zeros(max_length + 1)  # Sum over the tours of their squares
+
+    def _free_neighbours(self, point, visited):
+        x, y, z = point
+        size = self.grid_size
+        free = []
+        for dx, dy, dz in self.moves:
+            neighbour = (x + dx, y + dy, z + dz)
+            if (0 <= neighbour[0] < size and 0 <= neighbour[1] < size and 0 <= neighbour[2] < size
+                    and neighbour not in visited):
+                free.append(neighbour)
+        return free
+
+    def run_tour(self):
+        """
+        Run one tour and add it to the estimates.
+        Returns:
+        - list of (np.ndarray, float): The walks of max_length steps reached in the
+          tour, as (max_length + 1, 3) point arrays, with their scaled weights.
+        """
+        self.tours += 1
+        tour_sums = [0.0] * (self.max_length + 1)
+        samples = []
+        path = []
+        visited = set()
+
+        def enter(point, weight):
+            # Record the walk extended by point, then decide how often it continues
+            n = len(path)
+            path.append(point)
+            visited.add(point)
+            tour_sums[n] += weight
+            if n == self.max_length:
+                samples.append((np.array(path), weight))
+                return [weight, 0, []]
+            copies = 1
+            estimate = (self.sums[n] + tour_sums[n]) / self.tours
+            if weight > self.upper * estimate:
+                copies, weight = 2, weight / 2
+            elif weight < self.lower * estimate:
+                if self.random.random() < 0.5:
+                    copies = 0
+                else:
+                    weight *= 2
+            return [weight, copies, self._free_neighbours(point, visited) if copies else []]
+
+        # Explicit stack of [weight, copies left, free neighbours], one frame per point of path
+        stack = [enter(self.start, 1.0)]
+        while stack:
+            frame = stack[-1]
+            weight, copies, free = frame
+            if copies == 0 or not free:
+                stack.pop()
+                visited.discard(path.pop())
+                continue
+            frame[1] -= 1
+            point = self.random.choice(free)
+            stack.append(enter(point, weight * len(free) / self.scale))
+
+        tour_sums = np.array(tour_sums)
+        self.sums += tour_sums
+        self.squares += tour_sums ** 2
+        return samples
+
+    def run(self, tours):
+        """
+        Run several tours.
+        Returns:
+        - list of (np.ndarray, float): Weighted walks of max_length steps, see run_tour.
+        """
+        samples = []
+        for _ in range(tours):
+            samples.extend(self.run_tour())
+        return samples
+
+    def estimate(self, scaled=False):
+        """
+        Estimate the number of walks of every length from the tours run so far.
+        Args:
+        - scaled (bool): Return c_n / scale^n, which does not overflow for walks
+          longer than a few hundred steps.
+        Returns:
+        - counts (np.ndarray): Estimate of c_n for n = 0 ... max_length.
+        - errors (np.ndarray): Standard error of each estimate.
+        """
+        if self.tours == 0:
+            raise ValueError("No tours have been run")
+        counts = self.sums / self.tours
+        if self.tours > 1:
+            variance = (self.squares / self.tours - counts ** 2) * self.tours / (self.tours - 1)
+            errors = np.sqrt(np.maximum(variance, 0) / self.tours)
+        else:
+            errors = np.full_like(counts, np.inf)
+        if not scaled:
+            with np.errstate(over='ignore'):
+                factor = float(self.scale) ** np.arange(self.max_length + 1)
+            counts, errors = counts * factor, errors * factor
+        return counts, errors
@@ -0,0 +1,102 @@
+import numpy as np
+
+from .parallel_counting import CUBE_MOVES
+
+# Moves of Grid3DVisualizer.generate_path in 3dGridAnalyze.py
+POSITIVE_MOVES = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+
+# Stopping reasons
+COMPLETE = 0  # The walk made all of its steps
+TRAPPED = 1   # Every neighbour was outside the box or already visited
+STOP_REASONS = ('complete', 'trapped')
+
+# Bit of a cell inside its occupancy byte
+_BITS = (1 << np.arange(8)).astype(np.uint8)
+
+def _cell_index(points, grid_size):
+    """Flat index of (x, y, z) points in the grid_size^3 box."""
+    return (points[..., 0] * grid_size + points[..., 1]) * grid_size + points[..., 2]
+
+def simulate_walks(grid_size, steps, walkers, moves=CUBE_MOVES, start=(0, 0, 0), rng=None):
+    """
+    Grow many self-avoiding walks in the grid_size^3 box at once.
+    Every walker keeps its visited cells in a row of a bit-packed occupancy
+    array of shape (walkers, grid_size^3 / 8). Each step checks the neighbours of
+    all walkers that are still running with one gather, and moves every walker
+    to a uniformly chosen free neighbour, the rule of generate_3d_path.
+    Args:
+    - grid_size (int): Points per axis, coordinates run over 0 ... grid_size - 1.
+      Grid3DVisualizer(size) uses grid_size = size + 1.
+    - steps (int): Number of steps of a complete walk.
+    - walkers (int): Number of walks.
+    - moves (list of tuple): Unit moves, CUBE_MOVES or POSITIVE_MOVES.
+    - start (tuple): Starting point.
+    - rng: Seed or np.random.Generator.
+    Returns:
+    - path_moves (np.ndarray): int8 array (walkers, steps), the index into moves of
+      every step and -1 after the walk stopped.
+    - lengths (np.ndarray): Number of steps each walk made.
+    - reasons (np.ndarray): Stopping reason of each walk, COMPLETE or TRAPPED.
+    """
+    rng = np.random.default_rng(rng)
+    moves = np.asarray(moves, dtype=np.int64)
+    start = np.asarray(start, dtype=np.int64)
+    if np.any(start < 0) or np.any(start >= grid_size):
+        raise ValueError(f"Start {tuple(start)} is outside the {grid_size}^3 box")
+
+    occupancy = np.zeros((walkers, (grid_size ** 3 + 7) // 8), dtype=np.uint8)
+    position = np.tile(start, (walkers, 1))
+    cell = _cell_index(start, grid_size)
+    occupancy[:, cell >> 3] |= _BITS[cell & 7]
+
+    path_moves = np.full((walkers, steps), -1, dtype=np.int8)
+    lengths = np.full(walkers, steps, dtype=np.int64)
+    reasons = np.full(walkers, COMPLETE, dtype=np.int8)
+    active = np.arange(walkers)
+    for step in range(steps):
+        if len(active) == 0:
+            break
+        candidates = position[active, None, :] + moves
+        inside = ((candidates >= 0) & (candidates < grid_size)).all(axis=2)
+        cells = _cell_index(np.clip(candidates, 0, grid_size - 1), grid_size)
+        free = inside & ((occupancy[active[:, None], cells >> 3] & _BITS[cells & 7]) == 0)
+
+        # Walkers without a free neighbour are trapped
+        moved = free.any(axis=1)
+        trapped = active[~moved]
+        lengths[trapped] = step
+        reasons[trapped] = TRAPPED
+
+        # Uniform choice among the free neighbours
+        tie_break = np.where(free, rng.random(free.shape), -1.0)
+        choice = tie_break.argmax(axis=1)[moved]
+        cells = cells[moved, choice]
+        active = active[moved]
+
+        position[active] += moves[choice]
+        occupancy[active, cells >> 3] |= _BITS[cells & 7]
+        path_moves[active, step] = choice
+    return path_moves, lengths, reasons
+
+def walk_points(path_moves, moves=CUBE_MOVES, start=(0, 0, 0)):
+    """
+    Turn the step arrays of simulate_walks into points.
+    Returns:
+    - np.ndarray: Array (walkers, steps + 1, 3); a walk that stopped early stays
+      at its last point.
+    """
+    moves = np.asarray(moves, dtype=np.int64)
+    steps = np.where(path_moves[..., None] >= 0, moves[path_moves], 0)
+    points = np.zeros(path_moves.shape[:-1] + (path_moves.shape[-1] + 1, 3), dtype=np.int64)
+    points[..., 0, :] = start
+    points[..., 1:, :] = np.asarray(start) + np.cumsum(steps, axis=-2)
+    return points
+
+def iter_walk_batches(grid_size, steps, total, batch_size=10000, moves=CUBE_MOVES, start=(0, 0, 0), rng=None):
+    """
+    Simulate total walks in batches of batch_size, so that millions of walks
+    run in bounded memory. Yields the results of simulate_walks for each batch.
+    """
+    rng = np.random.default_rng(rng)
+    for first in range(0, total, batch_size):
+        yield simulate_walks(grid_size, steps, min(batch_size, total - first), moves, start, rng)
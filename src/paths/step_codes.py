@@ -0,0 +1,95 @@
+import numpy as np
+
+# Step alphabets, the code of a step is its index in the tuple
+WALL_STEPS = ("N", "S", "E1", "E2")
+DYCK_STEPS = ("U", "D")
+MOTZKIN_STEPS = ("U", "D", "H")
+
+# Wall step codes
+N, S, E1, E2 = 0, 1, 2, 3
+
+# Fill value for padded 2-D step arrays
+PAD = 255
+
+def encode_steps(steps, alphabet=WALL_STEPS):
+    """
+    Encode a sequence of step strings as a uint8 code array.
+    Args:
+    - steps (iterable of str): Steps such as "N", "S", "E1", "E2".
+    - alphabet (tuple of str): Step alphabet, the code of a step is its index.
+    Returns:
+    - np.ndarray: uint8 step codes.
+    """
+    index = {step: code for code, step in enumerate(alphabet)}
+    try:
+        return np.fromiter((index[step] for step in steps), dtype=np.uint8)
+    except KeyError as error:
+        raise ValueError(f"Unknown step {error.args[0]!r} for alphabet {alphabet}") from None
+
+def decode_steps(codes, alphabet=WALL_STEPS):
+    """
+    Decode a uint8 code array back to a list of step strings.
+    """
+    return [alphabet[code] for code in np.asarray(codes).tolist()]
+
+def pack_paths(paths, alphabet=WALL_STEPS):
+    """
+    Pack many step lists into one ragged code array.
+    Args:
+    - paths (iterable of lists of str): The paths to pack.
+    - alphabet (tuple of str): Step alphabet.
+    Returns:
+    - codes (np.ndarray): uint8 codes of all paths, one after another.
+    - offsets (np.ndarray): int64 array of length n_paths + 1, path i is codes[offsets[i]:offsets[i + 1]].
+    """
+    paths = [list(path) for path in paths]
+    lengths = np.fromiter((len(path) for path in paths), dtype=np.int64, count=len(paths))
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes = encode_steps((step for path in paths for step in path), alphabet)
+    return codes, offsets
+
+def unpack_paths(codes, offsets, alphabet=WALL_STEPS):
+    """
+    Unpack a ragged code array into a list of step lists.
+    """
+    steps = decode_steps(codes, alphabet)
+    offsets = np.asarray(offsets).tolist()
+    return [steps[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+def pack_padded(matrix, lengths=None):
+    """
+    Convert a 2-D array of step codes (one path per row) to ragged form.
+    Args:
+    - matrix (np.ndarray): 2-D uint8 array, rows are padded with PAD.
+    - lengths (array-like): Row lengths, inferred from the PAD values if None.
+    Returns:
+    - codes, offsets: Ragged representation, see pack_paths.
+    """
+    matrix = np.asarray(matrix, dtype=np.uint8)
+    if lengths is None:
+        lengths = np.count_nonzero(matrix != PAD, axis=1)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    mask = np.arange(matrix.shape[1]) < lengths[:, None]
+    return matrix[mask], offsets
+
+def pad_paths(codes, offsets, fill=PAD):
+    """
+    Convert ragged step codes to a 2-D array with one path per row.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    lengths = np.diff(offsets)
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.full((len(lengths), width), fill, dtype=np.uint8)
+    mask = np.arange(width) < lengths[:, None]
+    matrix[mask] = codes
+    return matrix
+
+def path_index(offsets):
+    """
+    Return, for every step of a ragged array, the index of the path it belongs to.
+    """
+    lengths = np.diff(offsets)
+    return np.repeat(np.arange(len(lengths)), lengths)
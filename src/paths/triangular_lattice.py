@@ -0,0 +1,117 @@
+import random
+
+import numpy as np
+
+# Moves of randomParallelogramGridMove.py in lattice coordinates (i, j), the
+# point (i, j) lies at x = i + j / 2, y = j * sqrt(3) / 2
+DIRECTIONS = {'E': (1, 0), 'NE': (0, 1), 'SW': (0, -1)}
+OPPOSITE = {'NE': 'SW', 'SW': 'NE'}
+
+def to_cartesian(points):
+    """
+    Convert lattice points (i, j) to the (x, y) coordinates of the drawing.
+    Returns:
+    - np.ndarray: Float array of shape (n, 2).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return np.column_stack((points[:, 0] + points[:, 1] / 2, points[:, 1] * np.sqrt(3) / 2))
+
+class TriangularLatticePath:
+    """
+    Path on the triangular lattice built step by step with exact integer coordinates.
+    Two unit edges of the lattice can only meet at lattice points, so a path
+    crosses or touches itself exactly when it revisits a point. The visited
+    points and edges are kept in hash sets, which makes every check O(1).
+    """
+    def __init__(self, start=(0, 0), avoid='points', min_row=0):
+        """
+        Args:
+        - start (tuple): Starting lattice point.
+        - avoid (str): 'points' for self-avoiding paths (no crossing or touching),
+          'edges' to allow revisiting points but not edges, None for no check.
+        - min_row (int): Lowest row j the path may reach, None for no bound.
+        """
+        if avoid not in ('points', 'edges', None):
+            raise ValueError(f"avoid must be 'points', 'edges' or None, got {avoid!r}")
+        start = tuple(start)
+        self.avoid = avoid
+        self.min_row = min_row
+        self.points = [start]
+        self.moves = []
+        self.visited = {start}
+        self.edges = set()
+
+    @property
+    def position(self):
+        return self.points[-1]
+
+    @staticmethod
+    def _edge(a, b):
+        return (a, b) if a < b else (b, a)
+
+    def _target(self, direction):
+        di, dj = DIRECTIONS[direction]
+        i, j = self.points[-1]
+        return (i + di, j + dj)
+
+    def can_move(self, direction):
+        """Check in O(1) whether the path can take the step."""
+        # NE and SW do not undo each other
+        if self.moves and OPPOSITE.get(direction) == self.moves[-1]:
+            return False
+        target = self._target(direction)
+        if self.min_row is not None and target[1] < self.min_row:
+            return False
+        if self.avoid == 'points':
+            return target not in self.visited
+        if self.avoid == 'edges':
+            return self._edge(self.points[-1], target) not in self.edges
+        return True
+
+    def available_moves(self):
+        """List the steps the path can take, in the order E, NE, SW."""
+        return [direction for direction in DIRECTIONS if self.can_move(direction)]
+
+    def move(self, direction):
+        """
+        Take the step if it is allowed.
+        Returns:
+        - bool: True if the path moved.
+        """
+        if not self.can_move(direction):
+            return False
+        target = self._target(direction)
+        if self.avoid == 'edges':
+            self.edges.add(self._edge(self.points[-1], target))
+        self.visited.add(target)
+        self.points.append(target)
+        self.moves.append(direction)
+        return True
+
+    def lattice_points(self):
+        """Return the points as an int64 array of shape (n + 1, 2)."""
+        return np.array(self.points, dtype=np.int64)
+
+    def cartesian_points(self):
+        """Return the points in drawing coordinates, see to_cartesian."""
+        return to_cartesian(self.points)
+
+def random_triangular_path(length, seed=None, start=(0, 0), avoid='points', min_row=0):
+    """
+    Build a random path by choosing uniformly among the allowed steps.
+    Stops early when no step is allowed.
+    Args:
+    - length (int): Number of steps wanted.
+    - seed: Seed of the random number generator, or a random.Random.
+    - start, avoid, min_row: See TriangularLatticePath.
+    Returns:
+    - TriangularLatticePath: The path.
+    """
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    path = TriangularLatticePath(start, avoid, min_row)
+    for _ in range(length):
+        moves = path.available_moves()
+        if not moves:
+            break
+        path.move(rng.choice(moves))
+    return path
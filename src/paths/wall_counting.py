@@ -0,0 +1,165 @@
+import numpy as np
+
+# Wall moves, same displacements as is_valid_move in fibonnaci_paths.py
+DIRECTIONS = {'N': (0, 1), 'S': (0, -1), 'E1': (1, 0), 'E2': (2, 0)}
+
+# Classes of the last move, E1 and E2 behave the same for the path rules
+START, AFTER_N, AFTER_S, AFTER_E = 0, 1, 2, 3
+LAST_MOVE_CLASS = {None: START, 'N': AFTER_N, 'S': AFTER_S, 'E1': AFTER_E, 'E2': AFTER_E}
+
+def legal_moves(x, y, last_move, rows, cols):
+    """
+    List the moves is_valid_move accepts from (x, y).
+    The visited set is not needed: E1/E2 strictly increase x, and inside one
+    column a path makes either a single N or a run of S steps, so a move that
+    passes the other rules never lands on a visited point.
+    Args:
+    - x, y (int): Current position.
+    - last_move (str): The last move made (None if this is the first move).
+    - rows, cols (int): Grid dimensions.
+    Returns:
+    - list of str: Valid moves in the order 'N', 'S', 'E1', 'E2'.
+    """
+    moves = []
+    if last_move in ('E1', 'E2') and y + 1 < rows:
+        moves.append('N')
+    if last_move != 'N' and y - 1 >= 0:
+        moves.append('S')
+    if x + 1 < cols * 2:
+        moves.append('E1')
+    if x + 2 < cols * 2:
+        moves.append('E2')
+    return moves
+
+def _check_grid(rows, cols):
+    """Paths start at (0, 0), so the grid needs at least one row and one column."""
+    if rows < 1 or cols < 1:
+        raise ValueError(f"The wall needs at least one row and one column, got {rows}x{cols}")
+
+def initial_frontier(rows, cols):
+    """
+    Frontier of the empty path: one path at (0, 0) with no last move.
+    The frontier is an object array of exact counts indexed [last move class, y, x].
+    """
+    _check_grid(rows, cols)
+    frontier = np.zeros((4, rows, cols * 2), dtype=object)
+    frontier[START, 0, 0] = 1
+    return frontier
+
+def advance_frontier(frontier):
+    """
+    Extend every path counted in the frontier by one valid move.
+    Args:
+    - frontier (np.ndarray): Counts indexed [last move class, y, x].
+    Returns:
+    - np.ndarray: Counts of the paths one move longer.
+    """
+    following = np.zeros_like(frontier)
+    anywhere = frontier.sum(axis=0)
+
+    # E1 and E2 are always allowed inside the grid
+    following[AFTER_E, :, 1:] += anywhere[:, :-1]
+    following[AFTER_E, :, 2:] += anywhere[:, :-2]
+
+    # N only after E1 or E2
+    following[AFTER_N, 1:, :] = frontier[AFTER_E, :-1, :]
+
+    # S anywhere except right after N
+    following[AFTER_S, :-1, :] = (frontier[START] + frontier[AFTER_S] + frontier[AFTER_E])[1:, :]
+    return following
+
+def iter_frontiers(rows, cols, max_length=None):
+    """
+    Yield the frontier of the paths with 0, 1, 2, ... moves.
+    Stops after max_length moves, or once no path can be extended any further.
+    """
+    frontier = initial_frontier(rows, cols)
+    length = 0
+    while frontier.any():
+        yield frontier
+        if max_length is not None and length >= max_length:
+            return
+        frontier = advance_frontier(frontier)
+        length += 1
+
+def count_wall_paths(rows, cols, max_length=None):
+    """
+    Count the valid wall paths of every length exactly.
+    Args:
+    - rows (int): Number of rows in the grid.
+    - cols (int): Number of columns in the grid.
+    - max_length (int): Longest path length (number of moves) to count, None for all.
+    Returns:
+    - list of int: counts[n] is the number of valid paths with n moves.
+    """
+    return [int(frontier.sum()) for frontier in iter_frontiers(rows, cols, max_length)]
+
+def count_wall_paths_by_endpoint(rows, cols, max_length=None):
+    """
+    Count the valid wall paths of every length by their end point.
+    Args:
+    - rows (int): Number of rows in the grid.
+    - cols (int): Number of columns in the grid.
+    - max_length (int): Longest path length (number of moves) to count, None for all.
+    Returns:
+    - list of np.ndarray: endpoints[n][y, x] is the number of paths with n moves ending at (x, y).
+    """
+    return [frontier.sum(axis=0) for frontier in iter_frontiers(rows, cols, max_length)]
+
+def completion_counts(rows, cols, length):
+    """
+    Count the valid continuations of every frontier state.
+    Args:
+    - rows (int): Number of rows in the grid.
+    - cols (int): Number of columns in the grid.
+    - length (int): Longest continuation length to tabulate.
+    Returns:
+    - list of np.ndarray: tables[k][last move class, y, x] is the number of ways
+      to make exactly k more valid moves from that state.
+    """
+    _check_grid(rows, cols)
+    tables = [np.ones((4, rows, cols * 2), dtype=object)]
+    for _ in range(length):
+        previous = tables[-1]
+        east = np.zeros((rows, cols * 2), dtype=object)
+        east[:, :-1] += previous[AFTER_E, :, 1:]
+        east[:, :-2] += previous[AFTER_E, :, 2:]
+        north = np.zeros_like(east)
+        north[:-1, :] = previous[AFTER_N, 1:, :]
+        south = np.zeros_like(east)
+        south[1:, :] = previous[AFTER_S, :-1, :]
+
+        table = np.empty_like(previous)
+        table[START] = east + south
+        table[AFTER_N] = east
+        table[AFTER_S] = east + south
+        table[AFTER_E] = east + north + south
+        tables.append(table)
+    return tables
+
+def longest_continuations(rows, cols):
+    """
+    Find the longest valid continuation of every frontier state.
+    Columns are processed from right to left, and inside a column S steps only
+    lead to lower rows, so every state depends on states already filled in.
+    Returns:
+    - list: longest[last move class][y][x] is the largest number of further moves.
+    """
+    _check_grid(rows, cols)
+    width = cols * 2
+    longest = [[[0] * width for _ in range(rows)] for _ in range(4)]
+    for x in range(width - 1, -1, -1):
+        east = [0] * rows
+        for y in range(rows):
+            if x + 1 < width:
+                east[y] = 1 + longest[AFTER_E][y][x + 1]
+            if x + 2 < width:
+                east[y] = max(east[y], 1 + longest[AFTER_E][y][x + 2])
+            longest[AFTER_N][y][x] = east[y]
+        for y in range(rows):
+            south = 1 + longest[AFTER_S][y - 1][x] if y > 0 else 0
+            longest[AFTER_S][y][x] = longest[START][y][x] = max(east[y], south)
+        for y in range(rows):
+            north = 1 + longest[AFTER_N][y + 1][x] if y + 1 < rows else 0
+            longest[AFTER_E][y][x] = max(longest[AFTER_S][y][x], north)
+    return longest
@@ -0,0 +1,143 @@
+from .wall_counting import DIRECTIONS, LAST_MOVE_CLASS, START, legal_moves, longest_continuations
+
+class WallPathEnumerator:
+    """
+    Lazily enumerate every valid wall path, depth first, in move order N, S, E1, E2.
+    Branches that cannot reach min_length moves are pruned with the longest
+    continuation table. The enumeration can be checkpointed after any yielded
+    path and resumed later, and split into disjoint shards: the subtrees below
+    the paths with shard_depth moves are dealt out round robin, while the
+    shorter paths belong to shard 0.
+    """
+    def __init__(self, rows, cols, max_length, min_length=0,
+                 shard=0, num_shards=1, shard_depth=2):
+        """
+        Args:
+        - rows, cols (int): Grid dimensions.
+        - max_length (int): Longest path length (number of moves) to enumerate.
+        - min_length (int): Shortest path length to yield.
+        - shard (int): Index of this shard, 0 <= shard < num_shards.
+        - num_shards (int): Number of disjoint shards the enumeration is split into.
+        - shard_depth (int): Length of the prefixes that are dealt out to the shards.
+        """
+        if not 0 <= shard < num_shards:
+            raise ValueError(f"Shard {shard} out of range for {num_shards} shards")
+        if shard_depth < 1:
+            raise ValueError("shard_depth must be at least 1")
+        self.rows = rows
+        self.cols = cols
+        self.max_length = max_length
+        self.min_length = min_length
+        self.shard = shard
+        self.num_shards = num_shards
+        self.shard_depth = shard_depth
+        self.longest = longest_continuations(rows, cols)
+
+        # Cursor: the last yielded path and the number of prefixes dealt out so far
+        self.last_path = None
+        self.prefix_count = 0
+        self.finished = False
+
+    def checkpoint(self):
+        """
+        Return the enumeration state as a JSON serializable dictionary.
+        """
+        return {
+            'rows': self.rows,
+            'cols': self.cols,
+            'max_length': self.max_length,
+            'min_length': self.min_length,
+            'shard': self.shard,
+            'num_shards': self.num_shards,
+            'shard_depth': self.shard_depth,
+            'last_path': None if self.last_path is None else list(self.last_path),
+            'prefix_count': self.prefix_count,
+            'finished': self.finished,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        """
+        Rebuild an enumerator that continues right after the checkpointed path.
+        """
+        enumerator = cls(checkpoint['rows'], checkpoint['cols'], checkpoint['max_length'],
+                         checkpoint['min_length'], checkpoint['shard'],
+                         checkpoint['num_shards'], checkpoint['shard_depth'])
+        if checkpoint['last_path'] is not None:
+            enumerator.last_path = tuple(checkpoint['last_path'])
+        enumerator.prefix_count = checkpoint['prefix_count']
+        enumerator.finished = checkpoint['finished']
+        return enumerator
+
+    def _frame(self, x, y, last_move, depth):
+        """Search frame of a node: position, last move, moves to try and the next one."""
+        moves = legal_moves(x, y, last_move, self.rows, self.cols) if depth < self.max_length else []
+        return [x, y, moves, 0]
+
+    def _restore(self):
+        """Rebuild the search stack along the last yielded path."""
+        x, y, last_move = 0, 0, None
+        frames = [self._frame(x, y, last_move, 0)]
+        for depth, move in enumerate(self.last_path, start=1):
+            frames[-1][3] = frames[-1][2].index(move) + 1
+            dx, dy = DIRECTIONS[move]
+            x, y, last_move = x + dx, y + dy, move
+            frames.append(self._frame(x, y, last_move, depth))
+        return frames
+
+    def __iter__(self):
+        """
+        Yield the paths as tuples of moves, continuing from the cursor.
+        """
+        if self.finished:
+            return
+        if self.last_path is None:
+            if self.longest[START][0][0] < self.min_length:
+                self.finished = True
+                return
+            frames = [self._frame(0, 0, None, 0)]
+            path = []
+            if self.min_length == 0 and self.shard == 0:
+                self.last_path = ()
+                yield ()
+        else:
+            frames = self._restore()
+            path = list(self.last_path)
+
+        while frames:
+            frame = frames[-1]
+            x, y, moves, index = frame
+            if index == len(moves):
+                frames.pop()
+                if path:
+                    path.pop()
+                continue
+            frame[3] = index + 1
+
+            move = moves[index]
+            dx, dy = DIRECTIONS[move]
+            depth = len(path) + 1
+
+            # Dead branch: no continuation reaches the minimum length
+            if depth + self.longest[LAST_MOVE_CLASS[move]][y + dy][x + dx] < self.min_length:
+                continue
+
+            if depth == self.shard_depth:
+                prefix = self.prefix_count
+                self.prefix_count += 1
+                if prefix % self.num_shards != self.shard:
+                    continue
+
+            path.append(move)
+            frames.append(self._frame(x + dx, y + dy, move, depth))
+            if depth >= self.min_length and (depth >= self.shard_depth or self.shard == 0):
+                self.last_path = tuple(path)
+                yield self.last_path
+
+        self.finished = True
+
+def iter_wall_paths(rows, cols, max_length, min_length=0):
+    """
+    Lazily yield every valid wall path with min_length to max_length moves.
+    """
+    return iter(WallPathEnumerator(rows, cols, max_length, min_length))
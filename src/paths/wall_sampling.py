@@ -0,0 +1,60 @@
+import random
+
+from .wall_counting import DIRECTIONS, LAST_MOVE_CLASS, START, completion_counts, legal_moves
+
+class UniformWallPathSampler:
+    """
+    Draw wall paths of a fixed length uniformly from all valid paths.
+    Each move is chosen with probability proportional to the number of valid
+    completions it leaves, read from precomputed exact count tables.
+    """
+    def __init__(self, rows, cols, length, seed=None):
+        """
+        Args:
+        - rows (int): Number of rows in the grid.
+        - cols (int): Number of columns in the grid.
+        - length (int): Number of moves of every sampled path.
+        - seed (int): Seed of the random generator, for reproducible runs.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.length = length
+        self.rng = random.Random(seed)
+        # Nested lists index faster than object arrays in the sampling loop
+        self.tables = [table.tolist() for table in completion_counts(rows, cols, length)]
+        self.total = self.tables[length][START][0][0]
+
+    def sample(self):
+        """
+        Draw one path.
+        Returns:
+        - path (list of tuples): The visited points, starting at (0, 0).
+        - moves (list of str): The sequence of moves made.
+        """
+        if self.total == 0:
+            raise ValueError(f"No valid path with {self.length} moves on a {self.rows}x{self.cols} wall")
+
+        x, y = 0, 0
+        path = [(0, 0)]
+        moves = []
+        last_move = None
+        for remaining in range(self.length, 0, -1):
+            completions = self.tables[remaining - 1]
+            pick = self.rng.randrange(self.tables[remaining][LAST_MOVE_CLASS[last_move]][y][x])
+            for move in legal_moves(x, y, last_move, self.rows, self.cols):
+                dx, dy = DIRECTIONS[move]
+                weight = completions[LAST_MOVE_CLASS[move]][y + dy][x + dx]
+                if pick < weight:
+                    break
+                pick -= weight
+            x, y = x + dx, y + dy
+            path.append((x, y))
+            moves.append(move)
+            last_move = move
+        return path, moves
+
+    def sample_many(self, count):
+        """
+        Draw count independent paths, see sample.
+        """
+        return [self.sample() for _ in range(count)]
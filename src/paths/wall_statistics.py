@@ -0,0 +1,98 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .batch_convert import _segment_sums
+from .step_codes import path_index
+
+# Displacements of the wall step codes N, S, E1, E2
+_DX = np.array([0, 0, 1, 2], dtype=np.int64)
+_DY = np.array([1, -1, 0, 0], dtype=np.int64)
+
+def wall_statistics(codes, offsets):
+    """
+    Width, area and height statistics of many wall paths at once.
+    The area is the signed area under the path, the sum of dx * y over the
+    horizontal steps, which is what q counts in the functional equation
+        F(z, q) = 1 + z^2 F(z, q) + z^2 q^2 F(zq, q) + z^4 q^2 F(zq, q) F(z, q)
+    of decompositionFromGeneratingFunction.py, while z counts the width.
+    Args:
+    - codes (np.ndarray): uint8 wall step codes of all paths (see step_codes).
+    - offsets (np.ndarray): Path boundaries, path i is codes[offsets[i]:offsets[i + 1]].
+    Returns:
+    - dict of np.ndarray, one value per path:
+        steps: number of steps,
+        width: sum of the horizontal steps (E1 = 1, E2 = 2),
+        area: sum of dx * y over the horizontal steps,
+        max_height: highest y reached,
+        final_height: y at the end.
+    """
+    codes = np.asarray(codes)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    dx = _DX[codes]
+    dy = _DY[codes]
+
+    # Height after every step, the running sum restarted at every path
+    heights = np.cumsum(dy)
+    starts = offsets[:-1]
+    before_path = np.concatenate(([0], heights))[starts]
+    heights -= before_path[path_index(offsets)]
+
+    steps = np.diff(offsets)
+    max_height = np.zeros(len(steps), dtype=np.int64)
+    nonempty = steps > 0
+    if nonempty.any():
+        max_height[nonempty] = np.maximum(np.maximum.reduceat(heights, starts[nonempty]), 0)
+
+    return {
+        'steps': steps,
+        'width': _segment_sums(dx, offsets),
+        'area': _segment_sums(dx * (heights - dy), offsets),
+        'max_height': max_height,
+        'final_height': _segment_sums(dy, offsets),
+    }
+
+def width_area_histogram(codes, offsets, max_width, max_area):
+    """
+    Count the wall paths by width and area.
+    Args:
+    - codes, offsets: Ragged wall step codes, see wall_statistics.
+    - max_width, max_area (int): Size of the table, larger widths and areas are not counted.
+    Returns:
+    - np.ndarray: int64 table of shape (max_width + 1, max_area + 1), laid out like
+      functional_equation_coefficients(max_width, max_area).
+    The valid wall paths of iter_wall_paths (the is_valid_move rules) do not
+    follow the decomposition of F, so their table differs from the series; only
+    the paths of decomposition_paths reproduce it.
+    """
+    statistics = wall_statistics(codes, offsets)
+    width, area = statistics['width'], statistics['area']
+    kept = (width <= max_width) & (area >= 0) & (area <= max_area)
+    cells = width[kept] * (max_area + 1) + area[kept]
+    counts = np.bincount(cells, minlength=(max_width + 1) * (max_area + 1))
+    return counts.reshape(max_width + 1, max_area + 1)
+
+@lru_cache(maxsize=None)
+def decomposition_paths(width):
+    """
+    Enumerate the wall paths of the given width built by the decomposition of F:
+        F = empty | E2 F | N E1 F' E1 S | N E1 F' E1 S E2 F
+    where F' is a path of F raised by one row.
+    Their width_area_histogram equals the coefficients of F, which checks the
+    statistics and the series engine against each other only: the paths come
+    from the decomposition itself, not from the wall rules of is_valid_move.
+    Returns:
+    - tuple of tuples of str: Every path of that width, cached.
+    """
+    if width < 0:
+        return ()
+    if width == 0:
+        return ((),)
+    paths = [("E2",) + rest for rest in decomposition_paths(width - 2)]
+    for inner in range(width - 1):
+        raised = [("N", "E1") + path + ("E1", "S") for path in decomposition_paths(inner)]
+        if inner + 2 == width:
+            paths.extend(raised)
+        rests = decomposition_paths(width - inner - 4)
+        paths.extend(block + ("E2",) + rest for block in raised for rest in rests)
+    return tuple(paths)
@@ -0,0 +1,15 @@
+"""
+Number sequences, generating functions and random Catalan paths.
+"""
+from .sequences import RecurrenceSequence, CATALAN, MOTZKIN, FIBONACCI, catalan_number, motzkin_number, fibonacci_number
+from .q_series import DEFAULT_MODULUS, functional_equation_coefficients
+from .randommixed import sample_dyck_paths, generate_catalan_path
+from .decompositionFromGeneratingFunction import decomposition_from_generating_function_console_output
+from .path_metrics import path_metrics, convex_hull_metrics, StreamingPathMetrics
+from .path_generating_function import monotone_path_coefficients, coefficients_from_paths, perm_path_coefficients, evaluate_generating_function
+from .kernel_method import (
+    DYCK_STEP_SET, MOTZKIN_STEP_SET, UNCONSTRAINED_WALL_STEP_SET, algebraic_generating_function,
+    excursion_recurrence, excursion_coefficients, meander_coefficients,
+)
+from .holonomic import HolonomicRecurrence, guess_recurrence
+from .result_cache import ResultCache, DEFAULT_CACHE, cached
@@ -1,10 +1,10 @@
-import sympy as sp
-
 def decomposition_from_generating_function_console_output():
     """
     Corrected version of decomposition calculation for the generator function,
     outputs results to the console.
     """
+    import sympy as sp
+
     # Define symbols
     z, q = sp.symbols('z q')  # Generator function variables
     F = sp.Function('F')  # F(z, q)
@@ -33,5 +33,6 @@ def decomposition_from_generating_function_console_output():
     print(f"NE1QE1S Contribution: {sp.simplify(ne1qe1s_contribution)}")
     print(f"NE1QE1SE2R Contribution: {sp.simplify(ne1qe1se2r_contribution)}")
 
-# Execute the function to display the results
-decomposition_from_generating_function_console_output()
+if __name__ == "__main__":
+    # Execute the function to display the results
+    decomposition_from_generating_function_console_output()
@@ -0,0 +1,288 @@
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+
+from .q_series import DEFAULT_MODULUS
+from .sequences import RecurrenceSequence
+
+# A P-recursive (holonomic) recurrence of order r and degree d is
+#     p_0(n) a(n) + p_1(n) a(n - 1) + ... + p_r(n) a(n - r) = 0,   n >= r,
+# with polynomials p_i of degree <= d. polynomials[i] holds the integer
+# coefficients of p_i, lowest degree first.
+
+# Binary splitting cancels common factors of the partial products below this size in bits
+_REDUCE_BITS = 1 << 20
+
+def _evaluate(polynomial, n):
+    value = 0
+    for coefficient in reversed(polynomial):
+        value = value * n + coefficient
+    return value
+
+def _system(terms, order, degree, modulus=None):
+    """Rows n = order ... len(terms) - 1, one column n^k a(n - i) per unknown."""
+    rows = []
+    for n in range(order, len(terms)):
+        row = []
+        for i in range(order + 1):
+            power = terms[n - i]
+            for _ in range(degree + 1):
+                row.append(power % modulus if modulus is not None else power)
+                power *= n
+        rows.append(row)
+    return rows
+
+def _rank_mod(rows, modulus):
+    """Rank of a matrix modulo a prime below 2^31, eliminating whole rows with numpy."""
+    matrix = np.array(rows, dtype=np.int64) % modulus
+    rank = 0
+    for column in range(matrix.shape[1]):
+        pivots = np.flatnonzero(matrix[rank:, column]) + rank
+        if len(pivots) == 0:
+            continue
+        pivot = pivots[0]
+        matrix[[rank, pivot]] = matrix[[pivot, rank]]
+        matrix[rank] = matrix[rank] * pow(int(matrix[rank, column]), -1, modulus) % modulus
+        factors = matrix[:, column].copy()
+        factors[rank] = 0
+        matrix = (matrix - factors[:, None] * matrix[rank]) % modulus
+        rank += 1
+        if rank == matrix.shape[0]:
+            break
+    return rank
+
+def _kernel_vector(rows, columns):
+    """One nonzero vector of the exact rational kernel, or None."""
+    matrix = [[Fraction(value) for value in row] for row in rows]
+    pivot_columns = []
+    rank = 0
+    for column in range(columns):
+        pivot = next((r for r in range(rank, len(matrix)) if matrix[r][column] != 0), None)
+        if pivot is None:
+            continue
+        matrix[rank], matrix[pivot] = matrix[pivot], matrix[rank]
+        lead = matrix[rank][column]
+        matrix[rank] = [value / lead for value in matrix[rank]]
+        for r in range(len(matrix)):
+            if r != rank and matrix[r][column] != 0:
+                factor = matrix[r][column]
+                matrix[r] = [value - factor * pivot_value for value, pivot_value in zip(matrix[r], matrix[rank])]
+        pivot_columns.append(column)
+        rank += 1
+    free = next((column for column in range(columns) if column not in pivot_columns), None)
+    if free is None:
+        return None
+    vector = [Fraction(0)] * columns
+    vector[free] = Fraction(1)
+    for r, column in enumerate(pivot_columns):
+        vector[column] = -matrix[r][free]
+    return vector
+
+class HolonomicRecurrence:
+    """
+    A P-recursive recurrence together with the terms that start it.
+    """
+    def __init__(self, polynomials, initial):
+        """
+        Args:
+        - polynomials (list of list of int): Coefficients of p_0 ... p_r, see the top of this module.
+        - initial (list): Known terms a(0), a(1), ... (int or Fraction), at least r of them.
+          Terms where p_0 vanishes must be among them.
+        """
+        self.polynomials = tuple(tuple(polynomial) for polynomial in polynomials)
+        self.order = len(self.polynomials) - 1
+        self.degree = max(len(polynomial) for polynomial in self.polynomials) - 1
+        self.initial = list(initial)
+        if len(self.initial) < self.order:
+            raise ValueError(f"A recurrence of order {self.order} needs {self.order} initial terms")
+
+    def __repr__(self):
+        parts = []
+        for i, polynomial in enumerate(self.polynomials):
+            monomials = [f"{c}" + (f"*n^{k}" if k > 1 else "*n" if k == 1 else "")
+                         for k, c in enumerate(polynomial) if c]
+            if monomials:
+                parts.append(f"({' + '.join(reversed(monomials))}) a(n{f' - {i}' if i else ''})")
+        return f"HolonomicRecurrence({' + '.join(parts)} = 0)"
+
+    def _leading(self, n):
+        value = _evaluate(self.polynomials[0], n)
+        if value == 0:
+            raise ValueError(f"p_0 vanishes at n = {n}, give the terms up to {n} as initial terms")
+        return value
+
+    def _matrix(self, n):
+        # V(n) = (a(n), ..., a(n - r + 1)) satisfies p_0(n) V(n) = M(n) V(n - 1)
+        lead = self._leading(n)
+        r = self.order
+        matrix = [[0] * r for _ in range(r)]
+        matrix[0] = [-_evaluate(polynomial, n) for polynomial in self.polynomials[1:]]
+        for k in range(1, r):
+            matrix[k][k - 1] = lead
+        return matrix, lead
+
+    @staticmethod
+    def _multiply(left, right):
+        size = len(left)
+        return [[sum(left[i][k] * right[k][j] for k in range(size)) for j in range(size)] for i in range(size)]
+
+    def _product(self, low, high):
+        """
+        M(high - 1) ... M(low) and p_0(low) ... p_0(high - 1) by binary splitting,
+        so that the big integer products are balanced.
+        """
+        if high - low <= 8:
+            product, denominator = None, 1
+            for n in range(low, high):
+                matrix, lead = self._matrix(n)
+                product = matrix if product is None else self._multiply(matrix, product)
+                denominator *= lead
+            return product, denominator
+        middle = (low + high) // 2
+        lower, lower_denominator = self._product(low, middle)
+        upper, upper_denominator = self._product(middle, high)
+        product, denominator = self._multiply(upper, lower), lower_denominator * upper_denominator
+        # Cancel the common factor while the gcd is still cheap, which keeps the
+        # products above this level several times smaller
+        if denominator.bit_length() < _REDUCE_BITS:
+            common = denominator
+            for row in product:
+                for value in row:
+                    common = gcd(common, value)
+            if common > 1:
+                product = [[value // common for value in row] for row in product]
+                denominator //= common
+        return product, denominator
+
+    def terms(self, count):
+        """Return the first count terms, unrolling the recurrence one step at a time."""
+        values = self.initial[:count]
+        r = self.order
+        for n in range(len(values), count):
+            numerator = -sum(_evaluate(self.polynomials[i], n) * values[n - i] for i in range(1, r + 1))
+            lead = self._leading(n)
+            if isinstance(numerator, int) and numerator % lead == 0:
+                values.append(numerator // lead)
+            else:
+                values.append(Fraction(numerator) / lead)
+        return values
+
+    def nth_term(self, n, modulus=None):
+        """
+        Return a(n) without computing the terms in between one by one: the
+        product of the step matrices from the last initial term to n is formed
+        by binary splitting, which is fast for big integers. Modulo a prime the
+        numbers stay small, so the steps are applied to the vector directly and
+        only the final denominator is inverted.
+        Args:
+        - n (int): Index of the term.
+        - modulus (int): Return a(n) modulo this prime instead; p_0 must not
+          vanish modulo the prime on the way.
+        """
+        start = len(self.initial)
+        if n < start:
+            value = self.initial[n]
+            return value % modulus if modulus is not None else value
+        if self.order == 0:
+            return 0
+        window = self.initial[start - self.order:][::-1]
+        if modulus is not None:
+            window = [value % modulus for value in window]
+            denominator = 1
+            for m in range(start, n + 1):
+                lead = _evaluate(self.polynomials[0], m) % modulus
+                value = -sum(_evaluate(polynomial, m) * v for polynomial, v in zip(self.polynomials[1:], window))
+                window = [value % modulus] + [v * lead % modulus for v in window[:-1]]
+                denominator = denominator * lead % modulus
+            return window[0] * pow(denominator, -1, modulus) % modulus
+        product, denominator = self._product(start, n + 1)
+        numerator = sum(coefficient * value for coefficient, value in zip(product[0], window))
+        if isinstance(numerator, Fraction):
+            return numerator / denominator
+        quotient, remainder = divmod(numerator, denominator)
+        return quotient if remainder == 0 else Fraction(numerator, denominator)
+
+    def check(self, terms):
+        """Whether the terms satisfy the recurrence."""
+        r = self.order
+        return all(
+            sum(_evaluate(self.polynomials[i], n) * terms[n - i] for i in range(r + 1)) == 0
+            for n in range(r, len(terms))
+        )
+
+    def to_sequence(self):
+        """
+        Serve an integer sequence from the recurrence as a RecurrenceSequence,
+        with its memo and checkpoints. The sequence starts from the first order
+        terms and keeps a window of order values; the initial terms where p_0
+        vanishes are served as they are.
+        """
+        polynomials = self.polynomials
+        r = self.order
+        known = {n: value for n, value in enumerate(self.initial)
+                 if n >= r and _evaluate(polynomials[0], n) == 0}
+
+        def step(n, previous):
+            if n in known:
+                return known[n], 1
+            numerator = -sum(_evaluate(polynomials[i], n) * previous[-i] for i in range(1, r + 1))
+            return numerator, self._leading(n)
+        return RecurrenceSequence(self.initial[:r], step)
+
+def _normalise(vector, order, degree):
+    """Integer polynomials from a rational kernel vector, content removed."""
+    denominator = 1
+    for value in vector:
+        denominator = denominator * value.denominator // gcd(denominator, value.denominator)
+    integers = [int(value * denominator) for value in vector]
+    content = 0
+    for value in integers:
+        content = gcd(content, value)
+    integers = [value // content for value in integers]
+    polynomials = [integers[i * (degree + 1):(i + 1) * (degree + 1)] for i in range(order + 1)]
+    # Highest nonzero coefficient of p_0 positive, trailing zeros dropped
+    sign = next((1 if c > 0 else -1 for polynomial in polynomials for c in reversed(polynomial) if c), 1)
+    polynomials = [[c * sign for c in polynomial] for polynomial in polynomials]
+    for polynomial in polynomials:
+        while len(polynomial) > 1 and polynomial[-1] == 0:
+            polynomial.pop()
+    return polynomials
+
+def guess_recurrence(terms, max_order=4, max_degree=4, margin=8, modulus=DEFAULT_MODULUS):
+    """
+    Guess the P-recursive recurrence of smallest size that the terms satisfy.
+    Every (order, degree) pair is tried by increasing number of unknowns. The
+    linear system of the unknown polynomial coefficients is first ranked modulo
+    a prime, which rules out most pairs cheaply; a pair that has a kernel modulo
+    the prime is solved exactly over the rationals and checked on all terms.
+    Args:
+    - terms (list of int or Fraction): The first terms of the sequence, a(0), a(1), ...
+    - max_order, max_degree (int): Largest order r and degree d tried.
+    - margin (int): Equations required beyond the number of unknowns, so that
+      the guess is overdetermined.
+    - modulus (int): Prime below 2^31 used for the fast rank test.
+    Returns:
+    - HolonomicRecurrence: The recurrence, started by the given terms, or None.
+    """
+    terms = list(terms)
+    pairs = sorted(((order, degree) for order in range(1, max_order + 1) for degree in range(max_degree + 1)),
+                   key=lambda pair: ((pair[0] + 1) * (pair[1] + 1), pair[0]))
+    for order, degree in pairs:
+        unknowns = (order + 1) * (degree + 1)
+        if len(terms) - order < unknowns + margin:
+            continue
+        if all(isinstance(value, int) for value in terms):
+            if _rank_mod(_system(terms, order, degree, modulus), modulus) == unknowns:
+                continue
+        rows = _system(terms, order, degree)
+        vector = _kernel_vector(rows[:unknowns + margin], unknowns)
+        if vector is None:
+            continue
+        polynomials = _normalise(vector, order, degree)
+        if all(c == 0 for c in polynomials[0]):
+            continue
+        recurrence = HolonomicRecurrence(polynomials, terms)
+        if recurrence.check(terms):
+            return recurrence
+    return None
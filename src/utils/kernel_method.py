@@ -0,0 +1,110 @@
+from fractions import Fraction
+
+from .sequences import RecurrenceSequence
+
+# A step set maps the height change of a step (+1, 0, -1) to its weight, the
+# number of step types with that change. The paths start at height 0, never go
+# below it, and z counts the steps. With F(z, u) = sum over paths z^length u^height,
+# adding a step gives the catalytic functional equation
+#     F(z, u) = 1 + z S(u) F(z, u) - z c / u F(z, 0),   S(u) = a u + b + c / u,
+# where the last term removes the down steps from height 0.
+DYCK_STEP_SET = {1: 1, 0: 0, -1: 1}      # U, D of phi
+MOTZKIN_STEP_SET = {1: 1, 0: 1, -1: 1}   # U, H, D of psi
+# N, S, E1 and E2 as free steps. This drops the wall rules of is_valid_move (N
+# only after a horizontal step, no S right after N), so its counts are not wall
+# path counts; those come from the transfer matrices of wall_counting.
+UNCONSTRAINED_WALL_STEP_SET = {1: 1, 0: 2, -1: 1}
+
+def _weights(step_set):
+    unknown = set(step_set) - {1, 0, -1}
+    if unknown:
+        raise ValueError(f"Steps must change the height by +1, 0 or -1, got {sorted(unknown)}")
+    return step_set.get(1, 0), step_set.get(0, 0), step_set.get(-1, 0)
+
+def algebraic_generating_function(step_set):
+    """
+    Solve the functional equation of the step set with the kernel method.
+    The kernel K(z, u) = 1 - z S(u) vanishes on the small root u1(z), the one
+    that is a power series in z. Putting u = u1(z) into the equation cancels
+    F(z, u), which leaves F(z, 0) = u1(z) / (c z) for the excursions; u = 1 then
+    gives the meanders F(z, 1) = (1 - c z F(z, 0)) / (1 - z S(1)).
+    Returns:
+    - dict of sympy expressions in z (and u for the kernel):
+        kernel, root, excursions, meanders.
+    """
+    import sympy as sp
+
+    a, b, c = _weights(step_set)
+    z, u = sp.symbols('z u')
+    if a == 0 or c == 0:
+        raise ValueError("The kernel method needs both up and down steps")
+    kernel = 1 - z * (a * u + b + c / u)
+    root = (1 - b * z - sp.sqrt((1 - b * z) ** 2 - 4 * a * c * z ** 2)) / (2 * a * z)
+    excursions = sp.simplify(root / (c * z))
+    meanders = sp.simplify((1 - c * z * excursions) / (1 - z * (a + b + c)))
+    return {'kernel': kernel, 'root': root, 'excursions': excursions, 'meanders': meanders}
+
+def _excursion_step(a, b, c):
+    # E(z) solves a c z^2 E^2 - (1 - b z) E + 1 = 0, which is D-finite with
+    #     (m + 2) E_m = b (2m + 1) E_{m-1} + (4ac - b^2)(m - 1) E_{m-2}
+    discriminant = 4 * a * c - b * b
+
+    def step(m, previous):
+        return b * (2 * m + 1) * previous[1] + discriminant * (m - 1) * previous[0], m + 2
+    return step
+
+def excursion_recurrence(step_set):
+    """
+    The excursion counts (paths that end at height 0) as a RecurrenceSequence,
+    served from the linear recurrence derived from the algebraic equation.
+    Needs integer weights, like RecurrenceSequence.
+    """
+    a, b, c = _weights(step_set)
+    return RecurrenceSequence([1, b], _excursion_step(a, b, c))
+
+def excursion_coefficients(step_set, count, modulus=None):
+    """
+    First count coefficients of the excursion generating function F(z, 0).
+    Args:
+    - step_set (dict): Weights of the +1, 0 and -1 steps, such as MOTZKIN_STEP_SET.
+      Fraction weights give Fraction coefficients.
+    - count (int): Number of coefficients.
+    - modulus (int): Reduce modulo this prime, with count + 1 < modulus.
+    Returns:
+    - list: [z^0] ... [z^(count - 1)] of F(z, 0).
+    """
+    a, b, c = _weights(step_set)
+    step = _excursion_step(a, b, c)
+    integral = all(isinstance(weight, int) for weight in (a, b, c))
+    values = [1, b][:count]
+    if modulus is not None:
+        values = [value % modulus for value in values]
+    for m in range(2, count):
+        numerator, denominator = step(m, values[-2:])
+        if modulus is not None:
+            values.append(numerator * pow(denominator, -1, modulus) % modulus)
+        elif integral:
+            values.append(numerator // denominator)
+        else:
+            values.append(Fraction(numerator) / denominator)
+    return values
+
+def meander_coefficients(step_set, count, modulus=None):
+    """
+    First count coefficients of the meander generating function F(z, 1), the
+    paths with any final height. From F(z, 1) (1 - s z) = 1 - c z F(z, 0),
+    s = a + b + c, they follow from the excursions by
+        m_0 = 1,   m_n = s m_{n-1} - c E_{n-1}.
+    Args:
+    - step_set, count, modulus: See excursion_coefficients.
+    Returns:
+    - list: [z^0] ... [z^(count - 1)] of F(z, 1).
+    """
+    a, b, c = _weights(step_set)
+    total = a + b + c
+    excursions = excursion_coefficients(step_set, count, modulus)
+    values = [1][:count]
+    for n in range(1, count):
+        value = total * values[-1] - c * excursions[n - 1]
+        values.append(value % modulus if modulus is not None else value)
+    return values
@@ -0,0 +1,141 @@
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from .path_metrics import path_metrics
+from .result_cache import cached
+
+# A coefficient table is a pair (exponents, coefficients): exponents is an int64
+# array of rows (n, A_xy, A_yz, A_xz) sorted by n, and coefficients holds the
+# number (or the estimated number) of paths with n steps and those plane areas, so that
+#     G(z, q1, q2, q3) = sum coefficient * z^n q1^A_xy q2^A_yz q3^A_xz
+# with the plane areas of calculate_areas: A_xy = |dx| + |dy| summed over the steps.
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+def _merge(exponents, coefficients):
+    """Add up the coefficients of equal exponent rows and sort the rows by n."""
+    keys, inverse = np.unique(exponents, axis=0, return_inverse=True)
+    totals = np.bincount(inverse.reshape(-1), weights=coefficients, minlength=len(keys))
+    return _read_only(keys.astype(np.int64), totals)
+
+@lru_cache(maxsize=None)
+def monotone_path_coefficients(max_width, size=None):
+    """
+    Exact coefficient table of the paths of Grid3DVisualizer.generate_path:
+    unit steps in the positive x, y and z directions from (0, 0, 0), inside
+    [0, size]^3 if size is given. A path with a, b, c steps along x, y, z has
+    A_xy = a + b, A_yz = b + c, A_xz = a + c, and there are n! / (a! b! c!) of them.
+    The table is cached and read-only, so it is shared by every evaluation.
+    Args:
+    - max_width (int): Largest number of steps n.
+    - size (int): Side of the box, unbounded if None.
+    Returns:
+    - (exponents, coefficients): See the top of this module, float coefficients.
+    """
+    exponents = []
+    coefficients = []
+    limit = max_width if size is None else size
+    for n in range(max_width + 1):
+        for a in range(min(n, limit) + 1):
+            for b in range(max(0, n - a - limit), min(n - a, limit) + 1):
+                c = n - a - b
+                exponents.append((n, a + b, b + c, a + c))
+                coefficients.append(float(comb(n, a) * comb(n - a, b)))
+    return _read_only(np.array(exponents, dtype=np.int64).reshape(-1, 4), np.array(coefficients))
+
+def coefficients_from_paths(points, lengths=None, weights=None):
+    """
+    Coefficient table of a family of enumerated or sampled paths.
+    Args:
+    - points (array): Batch of paths, shape (walks, n + 1, 3), see path_metrics.
+    - lengths (array): Number of steps of every path, all n if None.
+    - weights (array): Weight of every path, 1 if None. With Rosenbluth or PERM
+      weights normalised to estimate counts, the table estimates the counts.
+    Returns:
+    - (exponents, coefficients): See the top of this module.
+    """
+    metrics = path_metrics(points, lengths)
+    exponents = np.column_stack((metrics['steps'], metrics['plane_areas']))
+    weights = np.ones(len(exponents)) if weights is None else np.asarray(weights, dtype=float)
+    return _merge(exponents, weights)
+
+@cached(skip_if_none=('seed',), depends=('..paths.perm_sampler', '..paths.parallel_counting', '.path_metrics'))
+def perm_path_coefficients(grid_size, max_width, tours=1000, seed=None):
+    """
+    Estimated coefficient table of the self-avoiding walks of generate_3d_path,
+    with one PERMSampler per length. Kept in the on-disk result cache when the
+    seed is given; without a seed every call draws a new estimate.
+    Args:
+    - grid_size (int): Points per axis of the box.
+    - max_width (int): Largest number of steps n.
+    - tours (int): PERM tours per length.
+    - seed: Seed of the samplers.
+    Returns:
+    - (exponents, coefficients): See the top of this module.
+    """
+    from ..paths.perm_sampler import PERMSampler
+
+    exponents = [np.zeros((1, 4), dtype=np.int64)]
+    coefficients = [np.ones(1)]
+    for n in range(1, max_width + 1):
+        sampler = PERMSampler(grid_size, n, seed=None if seed is None else seed * (max_width + 1) + n)
+        samples = sampler.run(tours)
+        if not samples:
+            continue
+        points = np.stack([path for path, _ in samples])
+        weights = np.array([weight for _, weight in samples]) * float(sampler.scale) ** n / tours
+        table = coefficients_from_paths(points, weights=weights)
+        exponents.append(table[0])
+        coefficients.append(table[1])
+    return _merge(np.concatenate(exponents), np.concatenate(coefficients))
+
+def evaluate_generating_function(table, z, q1, q2, q3, per_width=False, chunk_size=1 << 22):
+    """
+    Evaluate a coefficient table on whole grids of parameters at once.
+    z, q1, q2, q3 are broadcast against each other, so a surface is evaluated
+    by passing meshgrid arrays. The powers of every parameter are tabulated once,
+    and the terms are added up in chunks to keep the memory bounded.
+    Args:
+    - table: (exponents, coefficients) pair, see the top of this module.
+    - z, q1, q2, q3 (float or array): Width variable and the weights of A_xy, A_yz, A_xz.
+    - per_width (bool): Return the sum of every width separately.
+    - chunk_size (int): Number of term values computed at once.
+    Returns:
+    - np.ndarray: The value of G on the broadcast grid, or an array of shape
+      (max_width + 1,) + grid with one row per width if per_width is True.
+    """
+    exponents, coefficients = table
+    z, q1, q2, q3 = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (z, q1, q2, q3)))
+    shape = z.shape
+    parameters = [value.reshape(-1) for value in (z, q1, q2, q3)]
+    points = len(parameters[0])
+
+    # powers[i][k] is parameter i to the power k
+    powers = []
+    for column, values in enumerate(parameters):
+        highest = int(exponents[:, column].max()) if len(exponents) else 0
+        table_of_powers = np.ones((highest + 1, points))
+        for k in range(1, highest + 1):
+            np.multiply(table_of_powers[k - 1], values, out=table_of_powers[k])
+        powers.append(table_of_powers)
+
+    widths = int(exponents[:, 0].max()) + 1 if len(exponents) else 1
+    totals = np.zeros((widths, points))
+    rows = max(1, chunk_size // max(points, 1))
+    for first in range(0, len(exponents), rows):
+        block = exponents[first:first + rows]
+        terms = coefficients[first:first + rows, None] * powers[0][block[:, 0]]
+        for column in range(1, 4):
+            terms *= powers[column][block[:, column]]
+        # The rows are sorted by n, add up the runs of equal n
+        starts = np.flatnonzero(np.diff(block[:, 0], prepend=-1))
+        totals[block[starts, 0]] += np.add.reduceat(terms, starts, axis=0)
+
+    if per_width:
+        return totals.reshape((widths,) + shape)
+    return totals.sum(axis=0).reshape(shape)
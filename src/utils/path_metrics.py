@@ -0,0 +1,128 @@
+import numpy as np
+
+# Planes of calculate_areas and the axes they add up: A_xy = |dx| + |dy| ...
+PLANES = ('xy', 'yz', 'xz')
+PLANE_AXES = np.array([[0, 1], [1, 2], [0, 2]])
+
+def path_metrics(points, lengths=None, hull=False):
+    """
+    Metrics of one path or a batch of paths in a single vectorized pass.
+    Args:
+    - points (array): Points of one path, shape (n + 1, d), or of a batch of
+      paths, shape (walks, n + 1, d), such as the output of walk_points.
+    - lengths (array): Number of steps of every path of a batch, for paths that
+      stopped early; the points after the end are ignored. All n if None.
+    - hull (bool): Also compute the convex hull volume and surface area, which
+      needs scipy and loops over the paths.
+    Returns:
+    - dict: For each path (arrays for a batch)
+        steps: number of steps,
+        direction_changes: number of consecutive steps that differ,
+        axis_moves: sum of |step| along every axis, shape (d,),
+        plane_areas: A_xy, A_yz, A_xz of calculate_areas (3D paths only),
+        extents: max - min of the coordinates along every axis,
+        and convex_hull_volume, surface_area if hull is True.
+    """
+    points = np.asarray(points)
+    single = points.ndim == 2
+    if single:
+        points = points[None]
+    walks, size, _ = points.shape
+    n = size - 1
+    steps = np.diff(points, axis=1)
+    changes = (steps[:, 1:] != steps[:, :-1]).any(axis=2)
+    if lengths is None:
+        lengths = np.full(walks, n)
+    else:
+        # Steps and points past the end of a path are masked out, the points by
+        # clamping them to the last point of the path
+        lengths = np.asarray(lengths).reshape(walks)
+        inside = np.arange(n)[None, :] < lengths[:, None]
+        steps *= inside[:, :, None]
+        changes &= inside[:, 1:]
+        clamp = np.minimum(np.arange(size)[None, :], lengths[:, None])
+        points = np.take_along_axis(points, clamp[:, :, None], axis=1)
+
+    axis_moves = np.abs(steps).sum(axis=1)
+    metrics = {
+        'steps': lengths,
+        'direction_changes': changes.sum(axis=1),
+        'axis_moves': axis_moves,
+        'extents': points.max(axis=1) - points.min(axis=1),
+    }
+    if points.shape[2] == 3:
+        metrics['plane_areas'] = axis_moves[:, PLANE_AXES].sum(axis=2)
+    if hull:
+        volumes, areas = zip(*(convex_hull_metrics(points[w, :lengths[w] + 1]) for w in range(walks)))
+        metrics['convex_hull_volume'] = np.array(volumes)
+        metrics['surface_area'] = np.array(areas)
+    if single:
+        metrics = {key: value[0] for key, value in metrics.items()}
+    return metrics
+
+def convex_hull_metrics(points):
+    """
+    Volume and surface area of the convex hull of the points, 0 for flat or
+    too short paths.
+    """
+    from scipy.spatial import ConvexHull
+
+    try:
+        hull = ConvexHull(points)
+    except Exception:  # Qhull rejects flat point sets
+        return 0.0, 0.0
+    return hull.volume, hull.area
+
+class StreamingPathMetrics:
+    """
+    The metrics of path_metrics, updated as the steps of a path stream in, in
+    constant memory. The convex hull needs all points and is not available.
+    """
+    def __init__(self, start=(0, 0, 0)):
+        self.position = np.array(start)
+        self.low = self.position.copy()
+        self.high = self.position.copy()
+        self.axis_moves = np.zeros_like(self.position)
+        self.last_step = None
+        self.steps = 0
+        self.direction_changes = 0
+
+    def add_step(self, step):
+        """Add one step, a displacement vector."""
+        step = np.asarray(step)
+        if self.last_step is not None and np.any(step != self.last_step):
+            self.direction_changes += 1
+        self.last_step = step
+        self.steps += 1
+        self.position = self.position + step
+        np.minimum(self.low, self.position, out=self.low)
+        np.maximum(self.high, self.position, out=self.high)
+        self.axis_moves += np.abs(step)
+
+    def add_steps(self, steps):
+        """Add a chunk of steps, an array of shape (k, d), vectorized."""
+        steps = np.asarray(steps)
+        if len(steps) == 0:
+            return
+        if self.last_step is not None:
+            self.direction_changes += int(np.any(steps[0] != self.last_step))
+        self.direction_changes += int((steps[1:] != steps[:-1]).any(axis=1).sum())
+        self.last_step = steps[-1]
+        self.steps += len(steps)
+        positions = self.position + np.cumsum(steps, axis=0)
+        np.minimum(self.low, positions.min(axis=0), out=self.low)
+        np.maximum(self.high, positions.max(axis=0), out=self.high)
+        self.position = positions[-1]
+        self.axis_moves += np.abs(steps).sum(axis=0)
+
+    def metrics(self):
+        """Return the metrics of the steps so far, as path_metrics does."""
+        metrics = {
+            'steps': self.steps,
+            'direction_changes': self.direction_changes,
+            'axis_moves': self.axis_moves.copy(),
+            'extents': self.high - self.low,
+        }
+        if len(self.position) == 3:
+            metrics['plane_areas'] = self.axis_moves[PLANE_AXES].sum(axis=1)
+        return metrics
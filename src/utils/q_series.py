@@ -0,0 +1,421 @@
+import numpy as np
+
+from .result_cache import cached
+
+# Default NTT-friendly prime, 119 * 2^23 + 1
+DEFAULT_MODULUS = 998244353
+
+# Every term of the equation has even powers of z and q, so the engine works
+# with Z = z^2 and Q = q^2. Row i is the polynomial phi_i(Q) = [z^2i] F(z, q)
+# and [z^n] F(zq, q) = q^n [z^n] F(z, q) becomes Q^i phi_i(Q):
+#     phi_i = [i = 0] + phi_{i-1} + Q^i phi_{i-1} + Q sum_{a+b=i-2} Q^a phi_a phi_b
+
+def _row_sum_bounds(rows):
+    """
+    Coefficient sums of the rows at q = 1, which bound every coefficient of a row.
+    At q = 1 the recurrence becomes t_i = [i = 0] + 2 t_{i-1} + sum_{a+b=i-2} t_a t_b.
+    """
+    totals = []
+    largest = 1
+    for i in range(rows):
+        convolution = sum(totals[a] * totals[i - 2 - a] for a in range(i - 1))
+        totals.append((i == 0) + (2 * totals[i - 1] if i else 0) + convolution)
+        largest = max(largest, totals[i], convolution)
+    return largest
+
+def _unpack(packed, slots, slot_bytes):
+    """Split a packed row into its slot values."""
+    data = packed.to_bytes(slots * slot_bytes, 'little')
+    return [int.from_bytes(data[k * slot_bytes:(k + 1) * slot_bytes], 'little') for k in range(slots)]
+
+def _pack(values, slot_bytes):
+    """Pack nonnegative slot values into one integer."""
+    return int.from_bytes(b''.join(value.to_bytes(slot_bytes, 'little') for value in values), 'little')
+
+def _kronecker_rows(rows, slots, modulus=None):
+    """
+    Rows of the recurrence with every row packed into one integer, a fixed number
+    of bits per coefficient, so that a product of two rows is one integer product.
+    The slot width comes from the row sums, which bound every coefficient, so
+    packed slots never carry into each other.
+    """
+    if modulus is None:
+        bound = _row_sum_bounds(rows)
+    else:
+        bound = (modulus - 1) ** 2 * rows * slots + 2 * modulus
+    slot_bytes = (bound.bit_length() + 8) // 8
+    slot_bits = slot_bytes * 8
+    mask = (1 << (slots * slot_bits)) - 1
+
+    packed_rows = []
+    for i in range(rows):
+        packed = 1 if i == 0 else 0
+        if i >= 1:
+            previous = packed_rows[i - 1]
+            packed += previous + (previous << (i * slot_bits) if i < slots else 0)
+        if i >= 2:
+            convolution = 0
+            m = i - 2
+            for a in range(0, m // 2 + 1):
+                if a + 1 >= slots:
+                    break
+                b = m - a
+                product = packed_rows[a] * packed_rows[b]
+                # The pair is met as both Q^a phi_a phi_b and Q^b phi_b phi_a
+                convolution += product << (a * slot_bits)
+                if b != a and b + 1 < slots:
+                    convolution += product << (b * slot_bits)
+            packed += (convolution & mask) << slot_bits
+        packed &= mask
+        if modulus is not None:
+            packed = _pack([value % modulus for value in _unpack(packed, slots, slot_bytes)], slot_bytes)
+        packed_rows.append(packed)
+    return [_unpack(packed, slots, slot_bytes) for packed in packed_rows]
+
+def _is_prime(n):
+    """Deterministic Miller-Rabin for n < 3.3 * 10^24."""
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in bases:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _root_of_unity(modulus, length):
+    """
+    Return a primitive length-th root of unity modulo a prime below 2^31, or None
+    if the modulus does not support a number theoretic transform of that length.
+    """
+    if modulus >= 2 ** 31 or (modulus - 1) % length or not _is_prime(modulus):
+        return None
+    factors, rest, p = [], modulus - 1, 2
+    while p * p <= rest:
+        if rest % p == 0:
+            factors.append(p)
+            while rest % p == 0:
+                rest //= p
+        p += 1
+    if rest > 1:
+        factors.append(rest)
+    for generator in range(2, modulus):
+        if all(pow(generator, (modulus - 1) // p, modulus) != 1 for p in factors):
+            return pow(generator, (modulus - 1) // length, modulus)
+    return None
+
+class _NumberTheoreticTransform:
+    """
+    Radix-2 transform modulo a prime below 2^31, vectorized with int64 arrays.
+    The transform runs along the first axis, so a 2D array is transformed
+    column by column in one pass.
+    """
+    def __init__(self, length, modulus, root):
+        self.length = length
+        self.modulus = modulus
+        self.root = root
+        bits = length.bit_length() - 1
+        index = np.arange(length)
+        self.reversed = np.zeros(length, dtype=np.int64)
+        for bit in range(bits):
+            self.reversed |= ((index >> bit) & 1) << (bits - 1 - bit)
+        self.forward = self._twiddles(root)
+        self.inverse = self._twiddles(pow(root, -1, modulus))
+        self.scale = pow(length, -1, modulus)
+
+    def _twiddles(self, root):
+        # Powers of root up to length / 2 by doubling, every stage takes a stride of them
+        powers = np.ones(max(self.length // 2, 1), dtype=np.int64)
+        filled = 1
+        while filled < len(powers):
+            count = min(filled, len(powers) - filled)
+            powers[filled:filled + count] = powers[:count] * pow(root, filled, self.modulus) % self.modulus
+            filled += count
+        twiddles = []
+        size = 2
+        while size <= self.length:
+            twiddles.append(powers[::self.length // size][:size // 2].copy())
+            size *= 2
+        return twiddles
+
+    def _transform(self, values, twiddles):
+        modulus = self.modulus
+        data = np.asarray(values, dtype=np.int64)[self.reversed]
+        tail = data.shape[1:]
+        out = np.empty_like(data)
+        size = 2
+        for powers in twiddles:
+            half = size // 2
+            blocks = data.reshape((-1, size) + tail)
+            result = out.reshape((-1, size) + tail)
+            low = blocks[:, :half]
+            high = blocks[:, half:] * powers.reshape((-1,) + (1,) * len(tail))
+            high %= modulus
+            np.add(low, high, out=result[:, :half])
+            np.subtract(low, high, out=result[:, half:])
+            result[:, half:] += modulus
+            # Both halves are in [0, 2 modulus); as unsigned, x - modulus wraps
+            # around for x < modulus, so the minimum is x mod modulus
+            reduced = out.view(np.uint64)
+            np.minimum(reduced, reduced - np.uint64(modulus), out=reduced)
+            data, out = out, data
+            size *= 2
+        return data
+
+    def __call__(self, values):
+        values = np.asarray(values)
+        padded = np.zeros((self.length,) + values.shape[1:], dtype=np.int64)
+        padded[:len(values)] = values
+        return self._transform(padded, self.forward)
+
+    def invert(self, values):
+        return self._transform(values, self.inverse) * self.scale % self.modulus
+
+    def sub_transform(self, length):
+        """Transform of a length dividing this one, modulo the same prime."""
+        return _NumberTheoreticTransform(length, self.modulus, pow(self.root, self.length // length, self.modulus))
+
+def _ntt_primes(length, bound):
+    """
+    Transforms for the largest primes p < 2^31 with length dividing p - 1, as
+    many as it takes for their product to exceed bound.
+    """
+    transforms = []
+    product = 1
+    factor = (2 ** 31 - 2) // length
+    while product <= bound:
+        if factor == 0:
+            raise ValueError(f"Not enough NTT primes of length {length} for a bound of {bound.bit_length()} bits")
+        prime = factor * length + 1
+        root = _root_of_unity(prime, length)
+        if root is not None:
+            transforms.append(_NumberTheoreticTransform(length, prime, root))
+            product *= prime
+        factor -= 1
+    return transforms
+
+def _garner_digits(residues, primes):
+    """
+    Mixed radix digits d_j of the integers x with x = residues[j] modulo primes[j],
+    x = d_0 + d_1 p_0 + d_2 p_0 p_1 + ..., computed on int64 arrays.
+    """
+    digits = []
+    for j, prime in enumerate(primes):
+        value = np.asarray(residues[j], dtype=np.int64) % prime
+        for i in range(j):
+            value = (value - digits[i]) * pow(primes[i], -1, prime) % prime
+        digits.append(value)
+    return digits
+
+def _crt_exact(residues, primes):
+    """The nonnegative integers below the product of the primes with these residues."""
+    digits = _garner_digits(residues, primes)
+    value = digits[-1].astype(object)
+    for digit, prime in zip(digits[-2::-1], primes[-2::-1]):
+        value = value * prime + digit.astype(object)
+    return value
+
+def _crt_mod(residues, primes, modulus):
+    """The same integers as _crt_exact, reduced modulo a modulus below 2^31 in int64."""
+    digits = _garner_digits(residues, primes)
+    value = np.zeros_like(digits[0])
+    radix = 1
+    for digit, prime in zip(digits, primes):
+        value = (value + digit % modulus * radix) % modulus
+        radix = radix * prime % modulus
+    return value
+
+# Rows of a block of the online convolution are summed directly, larger blocks
+# are combined with transforms along the rows
+_BLOCK_ROWS = 64
+
+def _online_length(rows):
+    """Number of rows of the online convolution, a power of two times _BLOCK_ROWS."""
+    length = _BLOCK_ROWS
+    while length < rows:
+        length *= 2
+    return length
+
+def _ntt_rows(rows, slots, modulus, transforms):
+    """
+    Rows of the recurrence modulo a modulus below 2^31.
+    Every row and its Q^i shift are transformed once along Q, so the sum
+    C_m = sum_{a+b=m} Q^a phi_a phi_b is a convolution along the rows of the
+    transformed rows, one for every transform point. Row i needs C_{i-2} before
+    the rows after it exist, so the convolution is computed online, divide and
+    conquer style: once the first half of a block of rows is known, its products
+    with the rows already known are added to the C of the second half with one
+    transform along the rows, and blocks of _BLOCK_ROWS rows sum their remaining
+    products directly. That costs O(R S log(S) log(R)) for R rows of S slots,
+    instead of the O(R^2 S) of summing every C directly.
+    With one transform whose prime is the modulus itself C is already reduced;
+    otherwise the transforms run modulo several NTT primes whose product exceeds
+    every exact value of C, and C is rebuilt by the Chinese remainder theorem
+    before it is reduced. The transforms must have a length of at least
+    2 * slots and _online_length(rows).
+    """
+    q_length = 1
+    while q_length < 2 * slots:
+        q_length *= 2
+    online_length = _online_length(rows)
+    primes = [transform.modulus for transform in transforms]
+    q_transforms = [transform.sub_transform(q_length) for transform in transforms]
+    row_transforms = [{} for _ in transforms]
+    prefixes = [{} for _ in transforms]
+    # Transformed rows phi_a, shifted rows Q^a phi_a and the sums C_m, per prime
+    phi_hat = [np.zeros((online_length, q_length), dtype=np.int64) for _ in transforms]
+    shifted_hat = [np.zeros_like(hat) for hat in phi_hat]
+    sums_hat = [np.zeros_like(hat) for hat in phi_hat]
+    phi = np.zeros((rows, slots), dtype=np.int64)
+
+    def row_transform(j, length):
+        if length not in row_transforms[j]:
+            row_transforms[j][length] = transforms[j].sub_transform(length)
+        return row_transforms[j][length]
+
+    def block_sum(j, i):
+        """The products of C_{i-2} that no larger block has added."""
+        prime = primes[j]
+        shifted, hat = shifted_hat[j], phi_hat[j]
+        m = i - 2
+        first = i - i % _BLOCK_ROWS
+        if first == 0:
+            return (shifted[:m + 1] * hat[m::-1] % prime).sum(axis=0)
+        if m < first:
+            return 0
+        # Pairs with one index in the block, the other one is below the block
+        return ((shifted[first:m + 1] * hat[m - first::-1] % prime).sum(axis=0)
+                + (hat[first:m + 1] * shifted[m - first::-1] % prime).sum(axis=0))
+
+    def add_products(first, middle, last):
+        """Add the products with an index in first ... middle - 1 to C of the rows middle ... last - 1."""
+        size = last - first
+        for j, prime in enumerate(primes):
+            transform = row_transform(j, size)
+            shifted, hat = shifted_hat[j], phi_hat[j]
+            if first == 0:
+                product = transform(shifted[:middle]) * transform(hat[:middle]) % prime
+                offset = 0
+            else:
+                # The partners have indices below size - 2, which keeps the cyclic
+                # wrap of the length size transform out of the rows that are used
+                if size not in prefixes[j]:
+                    prefixes[j][size] = (transform(hat[:size - 2]), transform(shifted[:size - 2]))
+                hat_prefix, shifted_prefix = prefixes[j][size]
+                product = (transform(shifted[first:middle]) * hat_prefix % prime
+                           + transform(hat[first:middle]) * shifted_prefix % prime)
+                offset = first
+            convolution = transform.invert(product % prime)
+            target = sums_hat[j][middle - 2:last - 2]
+            target += convolution[middle - 2 - offset:last - 2 - offset]
+            target %= prime
+
+    def finish_row(i):
+        row = np.zeros(slots, dtype=np.int64)
+        if i == 0:
+            row[0] = 1
+        else:
+            row += phi[i - 1]
+            if i < slots:
+                row[i:] += phi[i - 1, :slots - i]
+        if i >= 2:
+            parts = [q_transforms[j].invert((sums_hat[j][i - 2] + block_sum(j, i)) % prime)
+                     for j, prime in enumerate(primes)]
+            convolution = parts[0] if primes == [modulus] else _crt_mod(parts, primes, modulus)
+            row[1:] += convolution[:slots - 1]
+        row %= modulus
+        phi[i] = row
+        # The row and its shift are transformed together, as two columns
+        both = np.zeros((slots, 2), dtype=np.int64)
+        both[:, 0] = row
+        if i < slots:
+            both[i:, 1] = row[:slots - i]
+        for j, transform in enumerate(q_transforms):
+            phi_hat[j][i], shifted_hat[j][i] = transform(both % transform.modulus).T
+
+    def solve(first, last):
+        if first >= rows:
+            return
+        if last - first == _BLOCK_ROWS:
+            for i in range(first, min(last, rows)):
+                finish_row(i)
+            return
+        middle = (first + last) // 2
+        solve(first, middle)
+        if middle < rows:
+            add_products(first, middle, last)
+        solve(middle, last)
+
+    solve(0, online_length)
+    return phi
+
+@cached
+def functional_equation_coefficients(max_n, max_k, modulus=None):
+    """
+    Compute [z^n q^k] F(z, q) for the functional equation of the paper
+        F(z, q) = 1 + z^2 F(z, q) + z^2 q^2 F(zq, q) + z^4 q^2 F(zq, q) F(z, q),
+    row by row: row n only depends on rows below n - 1.
+    The products of rows run through number theoretic transforms over int64
+    arrays, with the online convolution of _ntt_rows, O(N K log(K) log(N)) for
+    N rows and K columns. Modulo a prime p < 2^31 with p - 1 divisible by a large
+    enough power of two (such as DEFAULT_MODULUS) one transform is enough:
+    n = k = 2000 takes about 4 seconds and n = k = 4000 about 20. Any other
+    modulus below 2^31 needs three transforms and a Chinese remainder step per
+    row, about three times slower. Exact coefficients are computed modulo as
+    many primes as their size requires (one per 31 bits of the row sums, which
+    grow like 4^(n/2)) and combined at the end, so exact tables cost that many
+    modular runs: about 20 at n = k = 600 (some 10 seconds) and 34 at
+    n = k = 1000 (some 30). Prefer DEFAULT_MODULUS when residues are enough.
+    Moduli of 2^31 and above fall back to packing every row into one big
+    integer, which is only practical for n and k in the low hundreds.
+    Tables are kept in the on-disk result cache. The table is read-only either
+    way, int64 tables that come from the cache are memory maps.
+    Args:
+    - max_n (int): Largest power of z.
+    - max_k (int): Largest power of q.
+    - modulus (int): Compute the coefficients modulo this number, exactly if None.
+    Returns:
+    - np.ndarray: Table of shape (max_n + 1, max_k + 1), int64 with a modulus
+      below 2^63 and exact Python integers (object dtype) otherwise.
+    """
+    rows = max_n // 2 + 1
+    slots = max_k // 2 + 1
+    length = _online_length(rows)
+    while length < 2 * slots:
+        length *= 2
+
+    if modulus is None:
+        # Every coefficient of a row is at most the row sum
+        transforms = _ntt_primes(length, _row_sum_bounds(rows))
+        primes = [transform.modulus for transform in transforms]
+        residues = [_ntt_rows(rows, slots, prime, [transform]) for transform, prime in zip(transforms, primes)]
+        phi = _crt_exact(residues, primes)
+    elif modulus < 2 ** 31:
+        root = _root_of_unity(modulus, length)
+        if root is not None:
+            transforms = [_NumberTheoreticTransform(length, modulus, root)]
+        else:
+            # An exact convolution value is a sum of at most rows * slots products of residues
+            transforms = _ntt_primes(length, rows * slots * (modulus - 1) ** 2)
+        phi = _ntt_rows(rows, slots, modulus, transforms)
+    else:
+        phi = _kronecker_rows(rows, slots, modulus)
+
+    dtype = np.int64 if modulus is not None and modulus < 2 ** 63 else object
+    table = np.zeros((max_n + 1, max_k + 1), dtype=dtype)
+    for i in range(rows):
+        table[2 * i, ::2] = phi[i]
+    table.setflags(write=False)
+    return table
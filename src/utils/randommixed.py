@@ -1,28 +1,33 @@
-import matplotlib.pyplot as plt
-from math import comb
+import numpy as np
 
-# Catalan sayılarının hesaplanması
-def catalan_number(n):
-    return comb(2 * n, n) // (n + 1)
+# Catalan sayıları önbellekli dizi servisinden gelir
+from .sequences import CATALAN, catalan_number
+
+# Döngü lemması ile düzgün dağılımlı Dyck yolları (toplu üretim)
+def sample_dyck_paths(n, size, rng=None):
+    # n+1 yukarı ve n aşağı adımı karıştır; her dizinin 2n+1 döndürmesinden
+    # tam biri pozitif kalır, ilk adımı atılınca düzgün dağılımlı bir Dyck yolu verir.
+    # Dönüş: (size, 2n) boyutlu int8 dizisi, +1 yukarı, -1 aşağı
+    rng = np.random.default_rng(rng)
+    length = 2 * n + 1
+    steps = np.full((size, length), -1, dtype=np.int8)
+    steps[:, :n + 1] = 1
+    steps = rng.permuted(steps, axis=1)
+
+    # Önek toplamlarının son minimumu pozitif döndürmenin başlangıcıdır
+    prefix = np.zeros((size, length), dtype=np.int32)
+    np.cumsum(steps[:, :-1], axis=1, dtype=np.int32, out=prefix[:, 1:])
+    start = length - 1 - np.argmin(prefix[:, ::-1], axis=1)
+
+    # Döndür ve baştaki yukarı adımı at
+    index = (start[:, None] + 1 + np.arange(2 * n)) % length
+    return np.take_along_axis(steps, index, axis=1)
 
 # Catalan yolları oluşturma
-def generate_catalan_path(n):
-    path = []
-    x, y = 0, 0  # Başlangıç noktası
-    balance = 0  # Yukarı ve aşağı adımların dengesi
-    for _ in range(2 * n):
-        if balance == 0:
-            path.append("U")  # Yalnızca yukarı çıkabilir
-            balance += 1
-        elif len(path) == 2 * n - 1 or balance == n:
-            path.append("D")  # Yalnızca aşağı inebilir
-            balance -= 1
-        else:
-            # Rastgele yukarı veya aşağı seçimi, ancak dengeyi koruyarak
-            step = "U" if balance < n else "D"
-            path.append(step)
-            balance += 1 if step == "U" else -1
-    return path
+def generate_catalan_path(n, rng=None):
+    # Tüm Catalan yolları arasından düzgün dağılımlı rastgele bir yol, O(n)
+    steps = sample_dyck_paths(n, 1, rng)[0]
+    return ["U" if step == 1 else "D" for step in steps]
 
 # Catalan yolunu grid üzerinde çizme
 def draw_catalan_path(path, ax, color='blue', label=''):
@@ -41,6 +46,8 @@ def draw_catalan_path(path, ax, color='blue', label=''):
 
 # Catalan yollarını analiz ve görselleştirme
 def visualize_catalan_paths(n_paths, n_steps):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(8, 8))
     for i in range(n_paths):
         path = generate_catalan_path(n_steps)
@@ -52,7 +59,9 @@ def visualize_catalan_paths(n_paths, n_steps):
 
 # Analiz: Catalan sayıları ve yolların dağılımı
 def analyze_catalan_numbers(max_n):
-    numbers = [catalan_number(n) for n in range(max_n)]
+    import matplotlib.pyplot as plt
+
+    numbers = list(CATALAN.range(0, max_n))
     plt.figure(figsize=(10, 6))
     plt.bar(range(max_n), numbers, color='skyblue', edgecolor='black')
     plt.title("Catalan Numbers")
@@ -60,12 +69,16 @@ def analyze_catalan_numbers(max_n):
     plt.ylabel("C(n)")
     plt.show()
 
-# Parametreler
-n_steps = 10  # Adım sayısı
-n_paths = 5   # Üretilecek yol sayısı
+def main():
+    # Parametreler
+    n_steps = 10  # Adım sayısı
+    n_paths = 5   # Üretilecek yol sayısı
+
+    # Catalan yollarını görselleştir
+    visualize_catalan_paths(n_paths, n_steps)
 
-# Catalan yollarını görselleştir
-visualize_catalan_paths(n_paths, n_steps)
+    # Catalan sayılarını analiz et
+    analyze_catalan_numbers(10)
 
-# Catalan sayılarını analiz et
-analyze_catalan_numbers(10)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+# Results are stored under DMPROJECT_CACHE_DIR (default ~/.cache/dmproject);
+# DMPROJECT_CACHE=0 turns the cache off
+CACHE_DIR = os.environ.get("DMPROJECT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "dmproject"))
+CACHE_ENABLED = os.environ.get("DMPROJECT_CACHE", "1") != "0"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# One file per result: a plain array as .npy (read back memory-mapped), a tuple or
+# dict of arrays as .npz, anything else (object arrays, lists, dicts) pickled
+_EXTENSIONS = (".npy", ".npz", ".pkl")
+_TUPLE_PREFIX = "item_"
+
+def _fingerprint(value, digest):
+    """Feed a stable description of an argument into the hash."""
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        if value.dtype == object:
+            digest.update(pickle.dumps(value.tolist()))
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}(".encode())
+        for item in value:
+            _fingerprint(item, digest)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}(".encode())
+        for key in sorted(value, key=repr):
+            _fingerprint(key, digest)
+            _fingerprint(value[key], digest)
+        digest.update(b")")
+    elif hasattr(value, "__dict__") and not callable(value):
+        # Models such as WallModel are described by their class and attributes
+        digest.update(f"{type(value).__module__}.{type(value).__qualname__}".encode())
+        _fingerprint(vars(value), digest)
+    else:
+        digest.update(repr(value).encode())
+
+@functools.lru_cache(maxsize=None)
+def _source_version(path):
+    """Hash of a source file, so that editing the code invalidates its results."""
+    with open(path, "rb") as source:
+        return hashlib.sha256(source.read()).hexdigest()[:16]
+
+def _is_array_tuple(value):
+    return isinstance(value, tuple) and value and all(
+        isinstance(item, np.ndarray) and item.dtype != object for item in value)
+
+def _is_array_dict(value):
+    return isinstance(value, dict) and value and all(
+        isinstance(key, str) and isinstance(item, np.ndarray) and item.dtype != object
+        for key, item in value.items())
+
+class ResultCache:
+    """
+    Content-addressed store of function results on disk.
+    The key of a result is the sha256 of the function name, its bound arguments
+    and the version of its code. Reading a hit marks it as recently used,
+    and writes evict the least recently used results once the store is larger
+    than max_bytes.
+    """
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+        - directory (str): Where the results are stored, CACHE_DIR if None.
+        - max_bytes (int): Size limit of the store.
+        """
+        self.directory = directory or CACHE_DIR
+        self.max_bytes = max_bytes
+
+    def key(self, name, arguments, version=""):
+        """
+        Args:
+        - name (str): Qualified name of the function.
+        - arguments (dict): Bound arguments, defaults included.
+        - version (str): Version of the code that computes the result.
+        Returns:
+        - str: Hex digest identifying the result.
+        """
+        digest = hashlib.sha256(f"{name}\0{version}\0".encode())
+        _fingerprint(arguments, digest)
+        return digest.hexdigest()
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, key + extension)
+
+    def get(self, key):
+        """
+        Return (True, result) for a stored key and (False, None) otherwise.
+        Arrays come back read-only: plain arrays as memory maps, tuples and
+        dicts of arrays read from their .npz file.
+        """
+        for extension in _EXTENSIONS:
+            path = self._path(key, extension)
+            try:
+                if extension == ".npy":
+                    result = np.load(path, mmap_mode="r")
+                elif extension == ".npz":
+                    with np.load(path) as archive:
+                        if all(name.startswith(_TUPLE_PREFIX) for name in archive.files):
+                            result = tuple(archive[f"{_TUPLE_PREFIX}{i}"] for i in range(len(archive.files)))
+                            for item in result:
+                                item.setflags(write=False)
+                        else:
+                            result = {name: archive[name] for name in archive.files}
+                            for item in result.values():
+                                item.setflags(write=False)
+                else:
+                    with open(path, "rb") as stored:
+                        result = pickle.load(stored)
+                    if isinstance(result, np.ndarray):
+                        result.setflags(write=False)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+                # Partly written or corrupted entry, recompute it
+                self._remove(path)
+                continue
+            try:
+                os.utime(path)
+            except OSError:
+                pass  # Read-only or shared store, the hit just does not count as a use
+            return True, result
+        return False, None
+
+    def put(self, key, result):
+        """Store a result atomically and evict old results if needed."""
+        os.makedirs(self.directory, exist_ok=True)
+        if isinstance(result, np.ndarray) and result.dtype != object:
+            extension = ".npy"
+        elif _is_array_tuple(result) or _is_array_dict(result):
+            extension = ".npz"
+        else:
+            extension = ".pkl"
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stored:
+                if extension == ".npy":
+                    np.save(stored, result)
+                elif extension == ".npz":
+                    if isinstance(result, tuple):
+                        result = {f"{_TUPLE_PREFIX}{i}": item for i, item in enumerate(result)}
+                    np.savez(stored, **result)
+                else:
+                    pickle.dump(result, stored, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key, extension))
+        except BaseException:
+            self._remove(temporary)
+            raise
+        self.evict()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def entries(self):
+        """List (last use, size, path) of the stored results, least recently used first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(_EXTENSIONS):
+                path = os.path.join(self.directory, name)
+                try:
+                    status = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+        return sorted(entries)
+
+    def size(self):
+        """Total size of the stored results in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Remove the least recently used results until the store fits in max_bytes."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every stored result."""
+        self.evict(0)
+
+DEFAULT_CACHE = ResultCache()
+
+def cached(function=None, cache=None, skip_if_none=(), ignore=(), depends=()):
+    """
+    Decorator that keeps the results of a pure function in a ResultCache, keyed
+    by its arguments and the source files of its code: the file it is defined
+    in and the modules it depends on.
+    Args:
+    - cache (ResultCache): Store to use, DEFAULT_CACHE if None.
+    - skip_if_none (tuple of str): Arguments such as seeds; a call where one of
+      them is None is random and is neither looked up nor stored.
+    - ignore (tuple of str): Arguments that do not change the result, such as
+      the number of workers, left out of the key.
+    - depends (tuple): Modules whose code changes the result, as module objects
+      or module names; names may be relative to the package of the function,
+      like "..paths.perm_sampler". They are imported at the first call.
+    The undecorated function stays available as the uncached attribute.
+    """
+    if function is None:
+        return functools.partial(cached, cache=cache, skip_if_none=skip_if_none, ignore=ignore, depends=depends)
+
+    signature = inspect.signature(function)
+    name = f"{function.__module__}.{function.__qualname__}"
+    package = function.__module__.rpartition(".")[0]
+
+    @functools.lru_cache(maxsize=None)
+    def version():
+        modules = [importlib.import_module(module, package) if isinstance(module, str) else module
+                   for module in depends]
+        paths = [inspect.getsourcefile(function)] + [inspect.getsourcefile(module) for module in modules]
+        return "".join(_source_version(path) for path in paths)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not CACHE_ENABLED:
+            return function(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if any(bound.arguments.get(argument) is None for argument in skip_if_none):
+            return function(*args, **kwargs)
+        store = cache or DEFAULT_CACHE
+        arguments = {argument: value for argument, value in bound.arguments.items() if argument not in ignore}
+        key = store.key(name, arguments, version())
+        found, result = store.get(key)
+        if found:
+            return result
+        result = function(*args, **kwargs)
+        try:
+            store.put(key, result)
+        except (OSError, pickle.PicklingError):
+            pass  # A read-only or full disk only costs the recomputation
+        return result
+
+    wrapper.uncached = function
+    return wrapper
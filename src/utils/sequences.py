@@ -0,0 +1,153 @@
+from math import comb
+
+class RecurrenceSequence:
+    """
+    Integer sequence served from an incremental recurrence with a growable memo.
+    The first dense_limit values are kept in a table. Beyond it only a window of
+    consecutive values every checkpoint_stride indices is kept, so memory stays
+    small while any value is at most checkpoint_stride steps away from a known one.
+    """
+    def __init__(self, initial, step, direct=None, dense_limit=4096, checkpoint_stride=256):
+        """
+        Args:
+        - initial (list of int): The first values, as many as the recurrence order.
+        - step (function): step(n, previous) returns (numerator, denominator) with
+          value(n) = numerator // denominator, where previous holds the preceding values
+          oldest first. The numerator must be linear in the previous values.
+        - direct (function): Optional closed form, used for cold queries far from any known value.
+        - dense_limit (int): Number of values kept in the dense table.
+        - checkpoint_stride (int): Distance between checkpoints beyond the dense table.
+        """
+        self.initial = list(initial)
+        self.order = len(initial)
+        self.step = step
+        self.direct = direct
+        self.dense_limit = max(dense_limit, self.order)
+        self.checkpoint_stride = checkpoint_stride
+        self.table = list(initial)
+        self.checkpoints = {}  # n -> values at n - order + 1 ... n
+
+    def _window_before(self, n):
+        """Return the largest known index below n and the window of values ending there."""
+        last = min(n, len(self.table)) - 1
+        window = self.table[last - self.order + 1:last + 1]
+        for index, values in self.checkpoints.items():
+            if last < index < n:
+                last, window = index, values
+        return last, tuple(window)
+
+    def _iterate(self, last, window, stop):
+        """Yield (n, value) for n = last + 1 ... stop - 1, growing the memo on the way."""
+        window = list(window)
+        for n in range(last + 1, stop):
+            numerator, denominator = self.step(n, window)
+            value = numerator // denominator
+            window.append(value)
+            del window[0]
+            if n == len(self.table) and n < self.dense_limit:
+                self.table.append(value)
+            elif n >= self.dense_limit and n % self.checkpoint_stride == 0:
+                self.checkpoints[n] = tuple(window)
+            yield n, value
+
+    @staticmethod
+    def _check_index(n):
+        # Like math.comb behind the former catalan_number, a negative n is a ValueError
+        if n < 0:
+            raise ValueError(f"n must be a non-negative integer, got {n}")
+
+    def __getitem__(self, n):
+        self._check_index(n)
+        if n < len(self.table):
+            return self.table[n]
+        last, window = self._window_before(n)
+        if self.direct is not None and n - last > self.checkpoint_stride and n >= self.dense_limit:
+            return self.direct(n)
+        value = None
+        for _, value in self._iterate(last, window, n + 1):
+            pass
+        return value
+
+    def range(self, start, stop):
+        """
+        Yield the values at start ... stop - 1 in a single pass.
+        """
+        start = max(start, 0)
+        if start < self.order:
+            yield from self.table[start:min(stop, self.order)]
+            start = self.order
+        if start >= stop:
+            return
+        last, window = self._window_before(start)
+        for n, value in self._iterate(last, window, stop):
+            if n >= start:
+                yield value
+
+    def range_mod(self, start, stop, modulus):
+        """
+        Yield the values at start ... stop - 1 reduced modulo modulus.
+        Runs on residues only while every denominator is invertible, and falls
+        back to the exact values from the first index where it is not.
+        """
+        start = max(start, 0)
+        window = [value % modulus for value in self.initial]
+        for n in range(start, min(stop, self.order)):
+            yield window[n]
+        for n in range(self.order, stop):
+            numerator, denominator = self.step(n, window)
+            try:
+                inverse = pow(denominator, -1, modulus)
+            except ValueError:
+                for value in self.range(max(n, start), stop):
+                    yield value % modulus
+                return
+            value = numerator * inverse % modulus
+            window.append(value)
+            del window[0]
+            if n >= start:
+                yield value
+
+    def mod(self, n, modulus):
+        """
+        Return the value at n reduced modulo modulus.
+        """
+        self._check_index(n)
+        if n < len(self.table):
+            return self.table[n] % modulus
+        return next(self.range_mod(n, n + 1, modulus))
+
+def _catalan_step(n, previous):
+    # C(n) = 2(2n - 1) C(n - 1) / (n + 1)
+    return 2 * (2 * n - 1) * previous[0], n + 1
+
+def _motzkin_step(n, previous):
+    # (n + 2) M(n) = (2n + 1) M(n - 1) + 3(n - 1) M(n - 2)
+    return (2 * n + 1) * previous[1] + 3 * (n - 1) * previous[0], n + 2
+
+def _fibonacci_step(n, previous):
+    return previous[0] + previous[1], 1
+
+def _catalan_direct(n):
+    return comb(2 * n, n) // (n + 1)
+
+def _fibonacci_direct(n):
+    # Fast doubling: F(2k) = F(k)(2F(k + 1) - F(k)), F(2k + 1) = F(k)^2 + F(k + 1)^2
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == '1':
+            a, b = b, a + b
+    return a
+
+CATALAN = RecurrenceSequence([1], _catalan_step, _catalan_direct)
+MOTZKIN = RecurrenceSequence([1, 1], _motzkin_step)
+FIBONACCI = RecurrenceSequence([0, 1], _fibonacci_step, _fibonacci_direct)
+
+def catalan_number(n):
+    return CATALAN[n]
+
+def motzkin_number(n):
+    return MOTZKIN[n]
+
+def fibonacci_number(n):
+    return FIBONACCI[n]
@@ -1,10 +1,12 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from matplotlib.animation import FuncAnimation
+
+from ..paths.saw3d import POSITIVE_MOVES, simulate_walks, walk_points
+from ..utils.path_metrics import path_metrics
 
 class Grid3DVisualizer:
     def __init__(self, size=10):
+        import matplotlib.pyplot as plt
+
         self.size = size
         plt.style.use('dark_background')
         self.fig = plt.figure(figsize=(15, 10))
@@ -56,40 +58,15 @@ class Grid3DVisualizer:
         2. Yol ızgara sınırları içinde kalmalı
         3. Her adımda sadece bir birim hareket edilebilir
         """
-        path = [(0, 0, 0)]
-        visited = {(0, 0, 0)}
-        
-        directions = [
-            (1, 0, 0),   
-            (0, 1, 0),   
-            (0, 0, 1),   
-        ]
-        
-        current = (0, 0, 0)
-        for _ in range(steps):
-            possible_moves = []
-            
-            for dx, dy, dz in directions:
-                new_pos = (current[0] + dx, current[1] + dy, current[2] + dz)
-                
-                if (0 <= new_pos[0] <= self.size and 
-                    0 <= new_pos[1] <= self.size and 
-                    0 <= new_pos[2] <= self.size and 
-                    new_pos not in visited):
-                    possible_moves.append(new_pos)
-            
-            if not possible_moves:
-                break
-                
-            current = possible_moves[np.random.randint(len(possible_moves))]
-            path.append(current)
-            visited.add(current)
-        
+        path_moves, lengths, _ = simulate_walks(self.size + 1, steps, 1, moves=POSITIVE_MOVES)
+        path = walk_points(path_moves, moves=POSITIVE_MOVES)[0, :lengths[0] + 1]
         return np.array(path)
         
     def plot_path(self, path, animate=True):
         """Yolu çizer ve animasyon yapar"""
         if animate:
+            from matplotlib.animation import FuncAnimation
+
             line, = self.ax.plot([], [], [], 'w-', linewidth=2)
             scatter = self.ax.scatter([], [], [], c='yellow', s=100)
             
@@ -116,13 +93,13 @@ class Grid3DVisualizer:
             
     def calculate_areas(self, path):
         """Yolun her düzlemdeki alanını hesaplar"""
-        Axy = np.sum(np.abs(np.diff(path[:, [0, 1]], axis=0)))
-        Ayz = np.sum(np.abs(np.diff(path[:, [1, 2]], axis=0)))
-        Axz = np.sum(np.abs(np.diff(path[:, [0, 2]], axis=0)))
+        Axy, Ayz, Axz = path_metrics(path)['plane_areas']
         return Axy, Ayz, Axz
         
     def plot_volume_distribution(self, areas):
         """Hacim dağılımını pasta grafiği olarak gösterir"""
+        import matplotlib.pyplot as plt
+
         plt.style.use('dark_background')
         fig = plt.figure(figsize=(8, 8))
         ax = fig.add_subplot(111)
@@ -146,6 +123,8 @@ class Grid3DVisualizer:
         
     def show(self):
         """Görselleştirmeyi gösterir"""
+        import matplotlib.pyplot as plt
+
         plt.show()
 
 def main():
@@ -1,11 +1,17 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from scipy.spatial import ConvexHull
 
-def calculate_path_metrics(path_x, path_y, path_z):
-    """Calculate various metrics for the path"""
+from ..paths.perm_sampler import PERMSampler
+from ..paths.saw3d import simulate_walks, walk_points
+from ..utils.path_metrics import path_metrics
+
+def calculate_path_metrics(path_x, path_y, path_z, grid_size=20, tours=0, hull=False, seed=None):
+    """
+    Calculate various metrics for the path. The convex hull (scipy) is computed
+    only if hull is True, and the number of possible paths is estimated with
+    PERM only if tours > 0, from the seed of the sampler.
+    """
     points = np.column_stack((path_x, path_y, path_z))
+    metrics = path_metrics(points, hull=hull)
     
     # Path length (number of steps)
     path_length = len(path_x) - 1
@@ -16,89 +22,45 @@ def calculate_path_metrics(path_x, path_y, path_z):
     # Average segment length (always 1 in grid movement)
     avg_segment_length = 1.0
     
-    # Calculate area under the path (using convex hull)
-    try:
-        hull = ConvexHull(points)
-        volume = hull.volume
-        area = hull.area
-    except:
-        volume = 0
-        area = 0
-    
     # Path complexity (changes in direction)
-    direction_changes = 0
-    if len(points) > 2:
-        for i in range(1, len(points)-1):
-            v1 = tuple(points[i] - points[i-1])
-            v2 = tuple(points[i+1] - points[i])
-            if v1 != v2:
-                direction_changes += 1
-    
-    # Estimate reachable paths (more realistic than 6^n)
-    # Using a simplified estimation based on grid size and path length
-    grid_points = len(visited)  # Using the visited set from generate_3d_path
-    reachable_paths = min(grid_points * 6, 6 ** path_length)
+    direction_changes = int(metrics['direction_changes'])
+    
+    # Number of self-avoiding walks of the same length in the grid, estimated
+    # with PERM tours; the error is the standard error of the estimate
+    possible_paths = possible_paths_error = None
+    if tours:
+        sampler = PERMSampler(grid_size, path_length, start=tuple(points[0]), seed=seed)
+        sampler.run(tours)
+        counts, errors = sampler.estimate()
+        possible_paths, possible_paths_error = counts[path_length], errors[path_length]
     
     return {
         'steps': path_length,
         'total_distance': total_distance,
         'avg_segment_length': avg_segment_length,
-        'possible_paths': reachable_paths,
-        'convex_hull_volume': volume,
-        'surface_area': area,
+        'possible_paths': possible_paths,
+        'possible_paths_error': possible_paths_error,
+        'convex_hull_volume': metrics.get('convex_hull_volume', 0.0),
+        'surface_area': metrics.get('surface_area', 0.0),
+        'plane_areas': metrics['plane_areas'],
+        'extents': metrics['extents'],
         'direction_changes': direction_changes,
         'complexity_score': direction_changes / path_length if path_length > 0 else 0
     }
 
-def generate_3d_path(grid_size=20, path_length=50):
-    global visited  # Make visited accessible to calculate_path_metrics
-    
-    # Seed for randomness
-    np.random.seed(None)  # Different random path in each run
-    
-    # Starting point 0,0,0
-    path_x = [0]
-    path_y = [0]
-    path_z = [0]
-    
-    # Track visited points
-    visited = set([(0,0,0)])
-    
-    for _ in range(path_length):
-        # Calculate neighbor coordinates (direct neighbors only)
-        candidates = [
-            (path_x[-1]+1, path_y[-1], path_z[-1]),   # Right
-            (path_x[-1]-1, path_y[-1], path_z[-1]),   # Left
-            (path_x[-1], path_y[-1]+1, path_z[-1]),   # Up
-            (path_x[-1], path_y[-1]-1, path_z[-1]),   # Down
-            (path_x[-1], path_y[-1], path_z[-1]+1),   # Forward
-            (path_x[-1], path_y[-1], path_z[-1]-1)    # Backward
-        ]
-        
-        # Find points within grid boundaries and unvisited points
-        valid_moves = [
-            (x,y,z) for x,y,z in candidates 
-            if (0 <= x < grid_size and 
-                0 <= y < grid_size and 
-                0 <= z < grid_size and 
-                (x,y,z) not in visited)
-        ]
-        
-        # If there is nowhere to move, stop
-        if not valid_moves:
-            break
-        
-        # Randomly select the next point
-        next_x, next_y, next_z = valid_moves[np.random.randint(len(valid_moves))]
-        
-        # Add to path
-        path_x.append(next_x)
-        path_y.append(next_y)
-        path_z.append(next_z)
-        visited.add((next_x, next_y, next_z))
-    
-    # Calculate metrics
-    metrics = calculate_path_metrics(path_x, path_y, path_z)
+def generate_3d_path(grid_size=20, path_length=50, rng=None, tours=0):
+    import matplotlib.pyplot as plt
+
+    # Starting point 0,0,0, a uniformly chosen free neighbour at every step,
+    # stop when there is nowhere to move
+    rng = np.random.default_rng(rng)
+    path_moves, lengths, _ = simulate_walks(grid_size, path_length, 1, rng=rng)
+    points = walk_points(path_moves)[0, :lengths[0] + 1]
+    path_x, path_y, path_z = (points[:, axis].tolist() for axis in range(3))
+    
+    # Calculate metrics, the PERM estimate is seeded from the same generator
+    metrics = calculate_path_metrics(path_x, path_y, path_z, grid_size, tours=tours, hull=True,
+                                     seed=int(rng.integers(2 ** 63)))
     
     # Create figure with a specific size
     fig = plt.figure(figsize=(15, 8))
@@ -156,7 +118,8 @@ def generate_3d_path(grid_size=20, path_length=50):
     metrics_text += "─" * 20 + "\n"
     metrics_text += f"• Direction Changes: {metrics['direction_changes']}\n"
     metrics_text += f"• Complexity Score: {metrics['complexity_score']:.2f}\n"
-    metrics_text += f"• Possible Paths: {metrics['possible_paths']:,}\n"
+    if metrics['possible_paths'] is not None:
+        metrics_text += f"• Possible Paths: {metrics['possible_paths']:.3e} ± {metrics['possible_paths_error']:.1e}\n"
     
     # Add text box with metrics
     props = dict(boxstyle='round', facecolor='wheat', alpha=0.3)
@@ -170,12 +133,12 @@ def generate_3d_path(grid_size=20, path_length=50):
     return metrics
 
 if __name__ == "__main__":
-    metrics = generate_3d_path()
+    metrics = generate_3d_path(tours=200)
     print("\nDetailed Path Analysis:")
     print(f"Number of steps: {metrics['steps']}")
     print(f"Total distance: {metrics['total_distance']} units")
     print(f"Length per step: {metrics['avg_segment_length']:.2f} units")
-    print(f"Estimated reachable paths: {metrics['possible_paths']:,}")
+    print(f"Estimated possible paths: {metrics['possible_paths']:.4e} ± {metrics['possible_paths_error']:.1e}")
     print(f"Surface area (convex hull): {metrics['surface_area']:.2f}")
     print(f"Volume (convex hull): {metrics['convex_hull_volume']:.2f}")
     print(f"Direction changes: {metrics['direction_changes']}")
@@ -0,0 +1,8 @@
+"""
+Drawing helpers. matplotlib is imported by the drawing functions themselves, so
+importing this package stays cheap. The batch renderer lives in render_pipeline.
+"""
+from .wall_renderer import wall_lines, draw_wall_tiling, draw_wall_paths
+from .altıgenUcgenGridMove import HEX_MOVES, generate_hexagonal_paths, count_hexagonal_paths, draw_hexagonal_grid
+from .parallelogramGridMove import parallelogram_path, draw_parallelogram_grid, draw_parallelogram_path
+from .balanced_3d_path import PLANES, generate_balanced_walk, generate_balanced_walks
@@ -1,8 +1,8 @@
-import matplotlib.pyplot as plt
-from matplotlib.patches import RegularPolygon
 import numpy as np
 
-def draw_hexagonal_grid(rows, cols, paths=None, radius=1):
+from ..paths.parallel_counting import HEX_MOVES, HexModel, count_shard
+
+def draw_hexagonal_grid(rows, cols, paths=None, radius=1, ax=None):
     """
     Draw a hexagonal grid and overlay paths if provided.
     Args:
@@ -10,8 +10,14 @@ def draw_hexagonal_grid(rows, cols, paths=None, radius=1):
     - cols: Number of columns in the grid.
     - paths: List of paths (each path is a list of coordinates).
     - radius: Radius of the hexagons.
+    - ax: Axes to draw on. If None, a new figure is created and shown.
     """
-    fig, ax = plt.subplots(figsize=(10, 8))
+    from matplotlib.patches import RegularPolygon
+
+    show = ax is None
+    if show:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(10, 8))
     hex_height = np.sqrt(3) * radius  # Height of a hexagon
     for row in range(rows):
         for col in range(cols):
@@ -33,10 +39,12 @@ def draw_hexagonal_grid(rows, cols, paths=None, radius=1):
     ax.set_xlim(-radius, cols * 1.5 * radius)
     ax.set_ylim(-radius, rows * hex_height)
     ax.set_aspect('equal')
-    plt.xticks([])
-    plt.yticks([])
-    plt.title("Hexagonal Grid with Paths")
-    plt.show()
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_title("Hexagonal Grid with Paths")
+    if show:
+        plt.show()
+    return ax
 
 def generate_hexagonal_paths(start, length, rows, cols):
     """
@@ -49,14 +57,7 @@ def generate_hexagonal_paths(start, length, rows, cols):
     Returns:
     - List of paths.
     """
-    moves = [
-        (1, 0),   # Right
-        (-1, 0),  # Left
-        (1, -1),  # Right down
-        (-1, -1), # Left down
-        (1, 1),   # Right up
-        (-1, 1)   # Left up
-    ]
+    moves = HEX_MOVES
     paths = []
 
     def is_valid_move(current, move):
@@ -87,11 +88,54 @@ def generate_hexagonal_paths(start, length, rows, cols):
     backtrack([start])
     return paths
 
-# Parameters
-rows, cols = 6, 6
-start = (0, 0)  # Starting at the corner of the first hexagon
-length = 4  # Path length
+def count_hexagonal_paths(start, length, rows, cols, self_avoiding=False):
+    """
+    Count the paths generate_hexagonal_paths would return, without building them.
+    Paths are counted by dynamic programming over (position, steps), which takes
+    O(rows * cols * length) time.
+    Args:
+    - start: Starting point (x, y).
+    - length: Total number of steps in the path.
+    - rows: Number of rows in the grid.
+    - cols: Number of columns in the grid.
+    - self_avoiding: Only count paths that never revisit a point. These cannot be
+      counted by position alone, so they are counted by the depth-first search
+      of count_shard instead.
+    Returns:
+    - Total number of paths.
+    - Array of exact counts, endpoints[y, x] is the number of paths ending at (x, y).
+    """
+    x, y = start
+    if not (0 <= x < cols and 0 <= y < rows):
+        raise ValueError(f"Start {tuple(start)} is outside the {rows}x{cols} grid")
+
+    if self_avoiding:
+        counts, ends = count_shard(HexModel(rows, cols, start, self_avoiding=True), length)
+        endpoints = np.zeros((rows, cols), dtype=object)
+        for (x, y), count in ends.items():
+            endpoints[y, x] = count
+        return counts[length], endpoints
+
+    counts = np.zeros((rows, cols), dtype=object)
+    counts[y, x] = 1
+    for _ in range(length):
+        following = np.zeros_like(counts)
+        for dx, dy in HEX_MOVES:
+            # Every path at (x, y) continues to (x + dx, y + dy) if that is on the grid
+            following[max(dy, 0):rows + min(dy, 0), max(dx, 0):cols + min(dx, 0)] += \
+                counts[max(-dy, 0):rows - max(dy, 0), max(-dx, 0):cols - max(dx, 0)]
+        counts = following
+    return int(counts.sum()), counts
+
+def main():
+    # Parameters
+    rows, cols = 6, 6
+    start = (0, 0)  # Starting at the corner of the first hexagon
+    length = 4  # Path length
+
+    # Generate paths and draw
+    paths = generate_hexagonal_paths(start, length, rows, cols)
+    draw_hexagonal_grid(rows, cols, paths)
 
-# Generate paths and draw
-paths = generate_hexagonal_paths(start, length, rows, cols)
-draw_hexagonal_grid(rows, cols, paths)
+if __name__ == "__main__":
+    main()
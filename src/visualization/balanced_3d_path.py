@@ -1,10 +1,78 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from matplotlib.animation import FuncAnimation
+
+# PLANES ve PLANE_AXES: düzlemler ve hareket eksenleri, xy düzlemi x veya y yönünde ilerler
+from ..utils.path_metrics import PLANES, PLANE_AXES, path_metrics
+
+def generate_balanced_walks(size, steps, count, target=None, rng=None):
+    """
+    Generate many balanced walks at once, vectorized over the walks.
+    Every step picks the plane that is furthest behind its target share among
+    the planes that still have a legal move, and then a random open axis of that
+    plane. The moves only go in the positive x, y and z directions inside
+    [0, size]^3, so the walks never revisit a point, and a plane is feasible as
+    long as one of its two axes is below size. Some plane is feasible until the
+    walk reaches (size, size, size) after 3 * size steps, so every walk stops
+    after min(steps, 3 * size) steps and the time is bounded.
+    Args:
+    - size (int): Side length of the grid.
+    - steps (int): Number of steps wanted.
+    - count (int): Number of walks.
+    - target (sequence of float): Wanted share of the xy, yz and xz planes, equal if None.
+    - rng: Seed or np.random.Generator.
+    Returns:
+    - paths (np.ndarray): Points of the walks, shape (count, length + 1, 3).
+    - planes (np.ndarray): Plane index (into PLANES) of every step, shape (count, length).
+    - exhausted (bool): True if the grid filled up before steps steps.
+    """
+    rng = np.random.default_rng(rng)
+    target = np.full(len(PLANES), 1 / len(PLANES)) if target is None else np.asarray(target, dtype=float)
+    if target.shape != (len(PLANES),) or np.any(target < 0) or target.sum() <= 0:
+        raise ValueError(f"target must be {len(PLANES)} nonnegative weights, got {target}")
+    target = target / target.sum()
+
+    length = min(steps, 3 * size)
+    walks = np.arange(count)
+    paths = np.zeros((count, length + 1, 3), dtype=np.int64)
+    planes = np.zeros((count, length), dtype=np.int8)
+    moves = np.zeros((count, len(PLANES)), dtype=np.int64)
+    position = np.zeros((count, 3), dtype=np.int64)
+
+    for step in range(length):
+        open_axes = position < size
+        feasible = open_axes[:, PLANE_AXES].any(axis=2)
+
+        # Feasible planes furthest behind their target share, ties broken at random
+        deficit = np.where(feasible, target * (step + 1) - moves, -np.inf)
+        best = deficit.max(axis=1, keepdims=True)
+        tie_break = np.where(deficit >= best - 1e-9, rng.random(deficit.shape), -1.0)
+        plane = tie_break.argmax(axis=1)
+
+        # Random open axis of the chosen plane
+        axes = PLANE_AXES[plane]
+        tie_break = np.where(open_axes[walks[:, None], axes], rng.random(axes.shape), -1.0)
+        axis = axes[walks, tie_break.argmax(axis=1)]
+
+        position[walks, axis] += 1
+        moves[walks, plane] += 1
+        paths[:, step + 1] = position
+        planes[:, step] = plane
+    return paths, planes, steps > length
+
+def generate_balanced_walk(size, steps, target=None, rng=None):
+    """
+    Generate one balanced walk, see generate_balanced_walks.
+    Returns:
+    - path (np.ndarray): Points of the walk, shape (length + 1, 3).
+    - planes (np.ndarray): Plane index (into PLANES) of every step.
+    - exhausted (bool): True if the grid filled up before steps steps.
+    """
+    paths, planes, exhausted = generate_balanced_walks(size, steps, 1, target, rng)
+    return paths[0], planes[0], exhausted
 
 class BalancedGrid3DVisualizer:
     def __init__(self, size=10):
+        import matplotlib.pyplot as plt
+
         self.size = size
         plt.style.use('dark_background')
         self.fig = plt.figure(figsize=(15, 10))
@@ -58,69 +126,27 @@ class BalancedGrid3DVisualizer:
         # XZ düzlemi (yeşil)
         self.ax.plot_surface(X, np.zeros_like(X), Y, alpha=0.2, color='green', shade=True)
         
-    def generate_balanced_path(self, steps=30):
+    def generate_balanced_path(self, steps=30, target=None, rng=None):
         """
         Dengeli 3D yol oluşturur.
-        Her düzlemde eşit sayıda hareket olmasını sağlar.
+        Her düzlemde eşit sayıda (veya target oranında) hareket olmasını sağlar.
         """
-        path = [(0, 0, 0)]
-        visited = {(0, 0, 0)}
-        
-        # Her düzlem için hareket sayacı
-        moves = {
-            'xy': 0,  # x veya y yönünde hareket
-            'yz': 0,  # y veya z yönünde hareket
-            'xz': 0   # x veya z yönünde hareket
-        }
-        
-        # Her düzlem için hareket yönleri
-        plane_moves = {
-            'xy': [(1,0,0), (0,1,0)],    # x veya y yönünde
-            'yz': [(0,1,0), (0,0,1)],    # y veya z yönünde
-            'xz': [(1,0,0), (0,0,1)]     # x veya z yönünde
-        }
-        
-        current = (0, 0, 0)
-        step_count = 0
-        
-        while step_count < steps:
-            # En az hareket yapılan düzlemi seç
-            min_moves = min(moves.values())
-            candidate_planes = [p for p, m in moves.items() if m == min_moves]
-            plane = np.random.choice(candidate_planes)
-            
-            # Seçilen düzlemde olası hareketleri bul
-            possible_moves = []
-            for dx, dy, dz in plane_moves[plane]:
-                new_pos = (current[0] + dx, current[1] + dy, current[2] + dz)
-                
-                if (0 <= new_pos[0] <= self.size and 
-                    0 <= new_pos[1] <= self.size and 
-                    0 <= new_pos[2] <= self.size and 
-                    new_pos not in visited):
-                    possible_moves.append(new_pos)
-            
-            if not possible_moves:
-                # Bu düzlemde hareket mümkün değilse diğer düzlemleri dene
-                continue
-            
-            # Rastgele bir hareket seç ve uygula
-            new_pos = possible_moves[np.random.randint(len(possible_moves))]
-            path.append(new_pos)
-            visited.add(new_pos)
-            current = new_pos
-            moves[plane] += 1
-            step_count += 1
-        
+        path, planes, exhausted = generate_balanced_walk(self.size, steps, target, rng)
+
         print("\nHareket Dağılımı:")
-        for plane, count in moves.items():
+        counts = np.bincount(planes, minlength=len(PLANES))
+        for plane, count in zip(PLANES, counts):
             print(f"{plane} düzlemi: {count} hareket")
-            
-        return np.array(path)
-        
+        if exhausted:
+            print(f"Izgara {len(planes)} adımda doldu, {steps} adım istenmişti")
+
+        return path
+
     def plot_path(self, path, animate=True):
         """Yolu çizer ve animasyon yapar"""
         if animate:
+            from matplotlib.animation import FuncAnimation
+
             line, = self.ax.plot([], [], [], 'w-', linewidth=2)
             scatter = self.ax.scatter([], [], [], c='yellow', s=100)
             
@@ -147,13 +173,13 @@ class BalancedGrid3DVisualizer:
             
     def calculate_areas(self, path):
         """Yolun her düzlemdeki alanını hesaplar"""
-        Axy = np.sum(np.abs(np.diff(path[:, [0, 1]], axis=0)))
-        Ayz = np.sum(np.abs(np.diff(path[:, [1, 2]], axis=0)))
-        Axz = np.sum(np.abs(np.diff(path[:, [0, 2]], axis=0)))
+        Axy, Ayz, Axz = path_metrics(path)['plane_areas']
         return Axy, Ayz, Axz
         
     def plot_volume_distribution(self, areas):
         """Hacim dağılımını pasta grafiği olarak gösterir"""
+        import matplotlib.pyplot as plt
+
         plt.style.use('dark_background')
         fig = plt.figure(figsize=(8, 8))
         ax = fig.add_subplot(111)
@@ -177,6 +203,8 @@ class BalancedGrid3DVisualizer:
         
     def show(self):
         """Görselleştirmeyi gösterir"""
+        import matplotlib.pyplot as plt
+
         plt.show()
 
 def main():
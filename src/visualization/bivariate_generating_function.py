@@ -1,48 +1,59 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-# Define the generating function (simplified for numerical computation)
-def bivariate_generating_function(z, q1, q2, q3, max_width):
+from ..utils.path_generating_function import evaluate_generating_function, monotone_path_coefficients
+
+# Generating function of the 3D grid paths, weighted by their plane areas
+def bivariate_generating_function(z, q1, q2, q3, max_width, size=None, table=None):
     """
     Compute the generating function terms for a range of widths and area coefficients.
+    The term of width n is the sum over the paths with n steps of
+    z^n q1^A_xy q2^A_yz q3^A_xz, with the plane areas of calculate_areas.
     Args:
         z: The width variable.
-        q1, q2, q3: Coefficients for A_xy, A_yz, A_xz respectively.
+        q1, q2, q3: Coefficients for A_xy, A_yz, A_xz respectively. Every
+            parameter can be an array, they are broadcast against each other.
         max_width: Maximum width to compute.
+        size: Side of the grid of Grid3DVisualizer, unbounded if None.
+        table: Coefficient table to use instead of the exact counts of the
+            positive-step paths, e.g. from perm_path_coefficients.
 
     Returns:
         A dictionary containing results for each width.
     """
-    results = {}
-    for n in range(max_width + 1):
-        # For simplicity, assume contributions from the three areas scale with q1, q2, q3
-        # This is a heuristic numerical approximation
-        term = z**n * (q1**n + q2**n + q3**n)
-        results[n] = term
-    return results
-
-# Parameters for the generating function
-z = 0.5  # Width variable
-q1, q2, q3 = 1.1, 1.05, 0.9  # Area coefficients for A_xy, A_yz, A_xz
-max_width = 20  # Maximum width to compute
-
-# Compute the results
-results = bivariate_generating_function(z, q1, q2, q3, max_width)
-
-# Extract values for plotting
-widths = list(results.keys())
-values = [np.real(results[w]) for w in widths]  # Take the real part for plotting
-
-# Plot the results
-plt.figure(figsize=(10, 6))
-plt.plot(widths, values, marker='o', label="Generating Function Terms")
-plt.title("Numerical Results from Bivariate Generating Function")
-plt.xlabel("Width (n)")
-plt.ylabel("Generating Function Value")
-plt.grid()
-plt.legend()
-plt.show()
-
-# Display numerical values for confirmation
-for width, value in results.items():
-    print(f"Width {width}: Generating Function Value = {value}")
+    if table is None:
+        table = monotone_path_coefficients(max_width, size)
+    terms = evaluate_generating_function(table, z, q1, q2, q3, per_width=True)
+    return {n: terms[n] if n < len(terms) else np.zeros_like(terms[0]) for n in range(max_width + 1)}
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # Parameters for the generating function
+    z = 0.5  # Width variable
+    q1, q2, q3 = 1.1, 1.05, 0.9  # Area coefficients for A_xy, A_yz, A_xz
+    max_width = 20  # Maximum width to compute
+    size = 10  # Grid of Grid3DVisualizer(size=10)
+
+    # Compute the results
+    results = bivariate_generating_function(z, q1, q2, q3, max_width, size)
+
+    # Extract values for plotting
+    widths = list(results.keys())
+    values = [np.real(results[w]) for w in widths]  # Take the real part for plotting
+
+    # Plot the results
+    plt.figure(figsize=(10, 6))
+    plt.plot(widths, values, marker='o', label="Generating Function Terms")
+    plt.title("Numerical Results from Bivariate Generating Function")
+    plt.xlabel("Width (n)")
+    plt.ylabel("Generating Function Value")
+    plt.grid()
+    plt.legend()
+    plt.show()
+
+    # Display numerical values for confirmation
+    for width, value in results.items():
+        print(f"Width {width}: Generating Function Value = {value}")
+
+if __name__ == "__main__":
+    main()
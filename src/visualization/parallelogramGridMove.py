@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
 # Hareket fonksiyonları
@@ -12,44 +11,78 @@ def move_N(x, y):
 def move_S(x, y):
     return x - 1, y - sqrt8
 
-# Grid boyutu
-steps = 10  # Paralel kenar kenar uzunluğu artırıldı
-
-# Gridin çizimi
-for i in range(steps + 1):
-    # Paralel çizgiler (yukarı ve aşağı doğru)
-    x_start, y_start = 0, i * sqrt8
-    for j in range(steps + 1):
-        x_end, y_end = move_E(x_start, y_start)
-        plt.plot([x_start, x_end], [y_start, y_end], color="gray", linewidth=0.5)
-        x_start, y_start = x_end, y_end
-
-for i in range(steps + 1):
-    # Diyagonal yukarı (N) ve aşağı (S) çizgiler
-    x_start, y_start = i * 3, 0
-    for j in range(steps + 1 - i):
-        x_end, y_end = move_N(x_start, y_start)
-        plt.plot([x_start, x_end], [y_start, y_end], color="gray", linewidth=0.5)
-        x_start, y_start = x_end, y_end
-
-path = [(0, 0)]
-directions = ["E", "E", "N", "E", "N", "N", "E", "E", "S", "S", "E", "N","E"]
-
-for direction in directions:
-    x, y = path[-1]  # Mevcut yolun son noktasını başlangıç olarak al
-    if direction == "E":
-        path.append(move_E(x, y))
-    elif direction == "N":
-        path.append(move_N(x, y))
-    elif direction == "S":
-        path.append(move_S(x, y))
-
-# Güncellenen yolun çizimi
-path_x = [x for x, y in path]
-path_y = [y for x, y in path]
-plt.plot(path_x, path_y, color="blue", linewidth=2, marker="o")
-
-# Grid ve gösterim ayarları
-plt.gca().set_aspect("equal", adjustable="box")
-plt.grid(False)
-plt.show()
+MOVES = {"E": move_E, "N": move_N, "S": move_S}
+
+def draw_parallelogram_grid(steps, ax):
+    """
+    Paralelkenar gridi tek bir LineCollection ile çiz.
+    Art arda gelen E ve N adımları aynı doğru üzerinde olduğundan her grid
+    çizgisi tek bir segmenttir.
+    Args:
+    - steps (int): Paralel kenar kenar uzunluğu.
+    - ax: Çizim yapılacak eksen.
+    """
+    from matplotlib.collections import LineCollection
+
+    i = np.arange(steps + 1)
+    # Paralel çizgiler: (0, i * sqrt8) noktasından steps + 1 adet E adımı
+    horizontal = np.stack([np.stack([np.zeros_like(i), i * sqrt8], axis=1),
+                           np.stack([np.full_like(i, 3 * (steps + 1)), i * sqrt8], axis=1)], axis=1)
+    # Diyagonal (N/S) çizgiler: (i * 3, 0) noktasından steps + 1 - i adet N adımı
+    length = steps + 1 - i
+    diagonal = np.stack([np.stack([i * 3, np.zeros_like(i)], axis=1),
+                         np.stack([i * 3 + length, length * sqrt8], axis=1)], axis=1)
+    segments = np.concatenate([horizontal, diagonal]).astype(float)
+    ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.5))
+    ax.autoscale_view()
+
+def parallelogram_path(directions):
+    """
+    Yön listesinden yolun noktalarını hesapla.
+    Args:
+    - directions (list): "E", "N" ve "S" adımları.
+    Returns:
+    - list: (x, y) noktaları, (0, 0) ile başlar.
+    """
+    path = [(0, 0)]
+    for direction in directions:
+        x, y = path[-1]  # Mevcut yolun son noktasını başlangıç olarak al
+        if direction in MOVES:
+            path.append(MOVES[direction](x, y))
+    return path
+
+def draw_parallelogram_path(directions, steps=10, ax=None):
+    """
+    Paralelkenar gridi ve üzerindeki yolu çiz.
+    Args:
+    - directions (list): "E", "N" ve "S" adımları.
+    - steps (int): Paralel kenar kenar uzunluğu.
+    - ax: Çizim yapılacak eksen, None ise yeni bir figür açılır.
+    """
+    if ax is None:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots()
+    draw_parallelogram_grid(steps, ax)
+
+    # Güncellenen yolun çizimi
+    path = parallelogram_path(directions)
+    path_x = [x for x, y in path]
+    path_y = [y for x, y in path]
+    ax.plot(path_x, path_y, color="blue", linewidth=2, marker="o")
+
+    # Grid ve gösterim ayarları
+    ax.set_aspect("equal", adjustable="box")
+    ax.grid(False)
+    return ax
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # Grid boyutu
+    steps = 10  # Paralel kenar kenar uzunluğu artırıldı
+    directions = ["E", "E", "N", "E", "N", "N", "E", "E", "S", "S", "E", "N","E"]
+    draw_parallelogram_path(directions, steps)
+    plt.show()
+
+if __name__ == "__main__":
+    main()
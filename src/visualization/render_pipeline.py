@@ -0,0 +1,131 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..paths.convert_to_dyck import draw_brick_path, draw_dyck_path
+from ..paths.convert_to_motzkin import draw_motzkin_path_fixed
+from .altıgenUcgenGridMove import draw_hexagonal_grid
+from .parallelogramGridMove import draw_parallelogram_path
+
+# A job is a dict with a "kind", an "output" file (.png or .svg, any format
+# matplotlib can save) and the fields of its kind:
+#     wall:          path (N/S/E1/E2 moves), rows, cols
+#     dyck:          path (U/D steps)
+#     motzkin:       path (U/D/H steps)
+#     3d:            path (sequence of (x, y, z) points)
+#     hex:           paths (list of paths of (x, y) points), rows, cols
+#     parallelogram: path (E/N/S moves), steps
+# Optional fields: "dpi" and "title".
+
+FIGURE_SIZES = {
+    "wall": (10, 5),
+    "dyck": (10, 5),
+    "motzkin": (10, 5),
+    "3d": (10, 8),
+    "hex": (10, 8),
+    "parallelogram": (8, 6),
+}
+
+def _render_wall(job, ax):
+    draw_brick_path(job["path"], job.get("rows", 6), job.get("cols", 10), ax=ax)
+
+def _render_dyck(job, ax):
+    draw_dyck_path(job["path"], ax=ax)
+
+def _render_motzkin(job, ax):
+    draw_motzkin_path_fixed(job["path"], ax=ax)
+
+def _render_3d(job, ax):
+    points = np.asarray(job["path"], dtype=float).reshape(-1, 3)
+    ax.plot(points[:, 0], points[:, 1], points[:, 2], color='black', marker='o', linewidth=2)
+    ax.set_xlabel('X')
+    ax.set_ylabel('Y')
+    ax.set_zlabel('Z')
+    ax.set_title("3D Grid Path")
+
+def _render_hex(job, ax):
+    draw_hexagonal_grid(job.get("rows", 6), job.get("cols", 6), job.get("paths"), ax=ax)
+
+def _render_parallelogram(job, ax):
+    draw_parallelogram_path(job["path"], job.get("steps", 10), ax=ax)
+
+RENDERERS = {
+    "wall": _render_wall,
+    "dyck": _render_dyck,
+    "motzkin": _render_motzkin,
+    "3d": _render_3d,
+    "hex": _render_hex,
+    "parallelogram": _render_parallelogram,
+}
+
+# Figures of this process, one per kind, reused by every job of that kind
+_figures = {}
+
+def _figure_for(kind):
+    """
+    Return the cleared figure and axes of a kind, creating them on first use.
+    The figures never go through pyplot, so they need no GUI backend and are
+    not kept alive by the pyplot figure manager.
+    """
+    if kind not in _figures:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=FIGURE_SIZES[kind])
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111, projection='3d' if kind == "3d" else None)
+        _figures[kind] = (fig, ax)
+    fig, ax = _figures[kind]
+    ax.clear()
+    return fig, ax
+
+def render_job(job):
+    """
+    Render one job to its output file.
+    Args:
+    - job (dict): Job description, see the top of this module.
+    Returns:
+    - str: The output file.
+    """
+    kind = job["kind"]
+    if kind not in RENDERERS:
+        raise ValueError(f"Unknown job kind {kind!r}, expected one of {sorted(RENDERERS)}")
+    output = job["output"]
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fig, ax = _figure_for(kind)
+    RENDERERS[kind](job, ax)
+    if "title" in job:
+        ax.set_title(job["title"])
+    fig.savefig(output, dpi=job.get("dpi", 100))
+    return output
+
+def _init_worker():
+    """Process pool initializer, keeps the workers on the headless backend."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+def render_jobs(jobs, workers=None, chunksize=16):
+    """
+    Render many jobs to disk on all cores.
+    Every worker keeps one figure per kind and clears it between jobs, so the
+    cost of a job is drawing and saving only. Jobs are sent to the workers in
+    chunks to keep the inter-process traffic low.
+    Args:
+    - jobs (iterable of dict): Job descriptions, see the top of this module.
+    - workers (int): Number of processes, all cores if None, 1 renders in-process.
+    - chunksize (int): Number of jobs sent to a worker at once.
+    Returns:
+    - list of str: The output files, in job order.
+    """
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [render_job(job) for job in jobs]
+    chunksize = max(1, min(chunksize, len(jobs) // workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(render_job, jobs, chunksize=chunksize))
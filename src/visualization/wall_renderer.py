@@ -0,0 +1,78 @@
+import numpy as np
+
+def wall_lines(rows, cols):
+    """
+    Build every brick edge of the wall as a few vectorized polylines.
+    Even rows start at x = 0 and odd rows are shifted by one unit, as in the
+    brick pattern of the paper. Each horizontal level is one segment, and the
+    brick sides of a row are one square wave that goes up one side and down the
+    next, so the wall needs 2 * rows + 1 lines instead of one patch per brick.
+    Args:
+    - rows (int): Number of rows in the wall tiling.
+    - cols (int): Number of bricks in each row.
+    Returns:
+    - list of np.ndarray: Polylines, each an array of (x, y) points.
+    """
+    # Horizontal levels: each spans the bricks of the rows above and below it
+    levels = np.arange(rows + 1)
+    row_starts = np.arange(rows) % 2
+    above = row_starts[np.clip(levels, 0, rows - 1)]
+    below = row_starts[np.clip(levels - 1, 0, rows - 1)]
+    left = np.minimum(above, below)
+    right = np.maximum(above, below) + cols * 2
+    horizontal = np.stack([np.stack([left, levels], axis=1), np.stack([right, levels], axis=1)], axis=1)
+
+    # Brick sides: cols + 1 per row, alternately drawn upwards and downwards
+    row_index = np.arange(rows)[:, None]
+    side = np.arange(cols + 1)[None, :]
+    x = np.repeat(side * 2 + row_index % 2, 2, axis=1)
+    bottom = row_index + np.zeros_like(side)
+    y = np.stack([bottom + side % 2, bottom + 1 - side % 2], axis=2).reshape(rows, -1)
+    sides = np.stack([x, y], axis=2)
+    return list(horizontal.astype(float)) + list(sides.astype(float))
+
+def draw_wall_tiling(rows, cols, ax=None, dashed_left=False, color='black', linewidth=1.0):
+    """
+    Draw the brick pattern with a single LineCollection.
+    Args:
+    - rows (int): Number of rows in the wall tiling.
+    - cols (int): Number of bricks in each row.
+    - ax: Axes to draw on, a new figure is created if None.
+    - dashed_left (bool): Add a dashed line along the left edge of the wall.
+    Returns:
+    - The axes.
+    """
+    from matplotlib.collections import LineCollection
+
+    if ax is None:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(10, 5))
+
+    ax.add_collection(LineCollection(wall_lines(rows, cols), colors=color, linewidths=linewidth))
+    if dashed_left:
+        ax.plot([0, 0], [0, rows], linestyle='--', color=color)
+
+    # Axis limits and style
+    ax.set_xlim(0, cols * 2)
+    ax.set_ylim(0, rows)
+    ax.set_aspect('equal', adjustable='box')
+    ax.set_xticks([])
+    ax.set_yticks([])
+    return ax
+
+def draw_wall_paths(paths, ax, color='red', linewidth=2, alpha=1.0):
+    """
+    Draw many paths on a wall with a single LineCollection.
+    Args:
+    - paths (list): Each path is a sequence of (x, y) points.
+    - ax: Axes to draw on.
+    - color: One color for all paths, or a sequence with one color per path.
+    Returns:
+    - The LineCollection that was added.
+    """
+    from matplotlib.collections import LineCollection
+
+    lines = [np.asarray(path, dtype=float).reshape(-1, 2) for path in paths]
+    collection = LineCollection(lines, colors=color, linewidths=linewidth, alpha=alpha)
+    ax.add_collection(collection)
+    return collection